@@ -32,6 +32,13 @@
 #include <stdint.h>
 #include <string.h>
 
+/* Use the SSE2 salsa20/8 core wherever the target guarantees SSE2 (always
+ * on x86-64); other targets get the portable scalar code. */
+#if defined(__SSE2__) || defined(_M_X64) || (defined(_M_IX86_FP) && _M_IX86_FP >= 2)
+#  define SCRYPT_SSE2 1
+#  include <emmintrin.h>
+#endif
+
 /* MSVC compatibility: __inline is supported by MSVC but map to the
  * standard C99 inline keyword when available.  For older MSVC that
  * lacks stdint.h (< VS2010), typedefs would need to be provided
@@ -474,6 +481,369 @@ PBKDF2_SHA256(const uint8_t * passwd, size_t passwdlen, const uint8_t * salt,
 }
 
 
+#ifdef SCRYPT_SSE2
+
+/*
+ * SSE2 implementation, after Colin Percival's crypto_scrypt-sse.c.  Each
+ * 64-byte block is held with word i at position (i * 5 % 16), so that the
+ * salsa20/8 column and row rounds each operate on four 128-bit vectors and
+ * only need a lane shuffle in between.
+ */
+
+static void blkcpy(void *, const void *, size_t);
+static void blkxor(void *, const void *, size_t);
+static void salsa20_8(__m128i[4]);
+static void blockmix_salsa8(__m128i *, __m128i *, __m128i *, size_t);
+static uint64_t integerify(const void *, size_t);
+static void smix(uint8_t *, size_t, uint64_t, uint32_t *, uint32_t *);
+
+static void
+blkcpy(void * dest, const void * src, size_t len)
+{
+	__m128i * D = dest;
+	const __m128i * S = src;
+	size_t L = len / 16;
+	size_t i;
+
+	for (i = 0; i < L; i++)
+		D[i] = S[i];
+}
+
+static void
+blkxor(void * dest, const void * src, size_t len)
+{
+	__m128i * D = dest;
+	const __m128i * S = src;
+	size_t L = len / 16;
+	size_t i;
+
+	for (i = 0; i < L; i++)
+		D[i] = _mm_xor_si128(D[i], S[i]);
+}
+
+/**
+ * salsa20_8(B):
+ * Apply the salsa20/8 core to the provided block.
+ */
+static void
+salsa20_8(__m128i B[4])
+{
+	__m128i X0, X1, X2, X3;
+	__m128i T;
+	size_t i;
+
+	X0 = B[0];
+	X1 = B[1];
+	X2 = B[2];
+	X3 = B[3];
+
+	for (i = 0; i < 8; i += 2) {
+		/* Operate on "columns". */
+		T = _mm_add_epi32(X0, X3);
+		X1 = _mm_xor_si128(X1, _mm_slli_epi32(T, 7));
+		X1 = _mm_xor_si128(X1, _mm_srli_epi32(T, 25));
+		T = _mm_add_epi32(X1, X0);
+		X2 = _mm_xor_si128(X2, _mm_slli_epi32(T, 9));
+		X2 = _mm_xor_si128(X2, _mm_srli_epi32(T, 23));
+		T = _mm_add_epi32(X2, X1);
+		X3 = _mm_xor_si128(X3, _mm_slli_epi32(T, 13));
+		X3 = _mm_xor_si128(X3, _mm_srli_epi32(T, 19));
+		T = _mm_add_epi32(X3, X2);
+		X0 = _mm_xor_si128(X0, _mm_slli_epi32(T, 18));
+		X0 = _mm_xor_si128(X0, _mm_srli_epi32(T, 14));
+
+		/* Rearrange data. */
+		X1 = _mm_shuffle_epi32(X1, 0x93);
+		X2 = _mm_shuffle_epi32(X2, 0x4E);
+		X3 = _mm_shuffle_epi32(X3, 0x39);
+
+		/* Operate on "rows". */
+		T = _mm_add_epi32(X0, X1);
+		X3 = _mm_xor_si128(X3, _mm_slli_epi32(T, 7));
+		X3 = _mm_xor_si128(X3, _mm_srli_epi32(T, 25));
+		T = _mm_add_epi32(X3, X0);
+		X2 = _mm_xor_si128(X2, _mm_slli_epi32(T, 9));
+		X2 = _mm_xor_si128(X2, _mm_srli_epi32(T, 23));
+		T = _mm_add_epi32(X2, X3);
+		X1 = _mm_xor_si128(X1, _mm_slli_epi32(T, 13));
+		X1 = _mm_xor_si128(X1, _mm_srli_epi32(T, 19));
+		T = _mm_add_epi32(X1, X2);
+		X0 = _mm_xor_si128(X0, _mm_slli_epi32(T, 18));
+		X0 = _mm_xor_si128(X0, _mm_srli_epi32(T, 14));
+
+		/* Rearrange data. */
+		X1 = _mm_shuffle_epi32(X1, 0x39);
+		X2 = _mm_shuffle_epi32(X2, 0x4E);
+		X3 = _mm_shuffle_epi32(X3, 0x93);
+	}
+
+	B[0] = _mm_add_epi32(B[0], X0);
+	B[1] = _mm_add_epi32(B[1], X1);
+	B[2] = _mm_add_epi32(B[2], X2);
+	B[3] = _mm_add_epi32(B[3], X3);
+}
+
+/**
+ * blockmix_salsa8(Bin, Bout, X, r):
+ * Compute Bout = BlockMix_{salsa20/8, r}(Bin).  The input Bin must be 128r
+ * bytes in length; the output Bout must also be the same size.  The
+ * temporary space X must be 64 bytes.
+ */
+static void
+blockmix_salsa8(__m128i * Bin, __m128i * Bout, __m128i * X, size_t r)
+{
+	size_t i;
+
+	/* 1: X <-- B_{2r - 1} */
+	blkcpy(X, &Bin[8 * r - 4], 64);
+
+	/* 2: for i = 0 to r - 1 do */
+	for (i = 0; i < r; i++) {
+		/* 3: X <-- H(X \xor B_i) */
+		blkxor(X, &Bin[i * 8], 64);
+		salsa20_8(X);
+
+		/* 4: Y_i <-- X */
+		/* 6: B' <-- (Y_0, Y_2 ... Y_{2r-2}, Y_1, Y_3 ... Y_{2r-1}) */
+		blkcpy(&Bout[i * 4], X, 64);
+
+		/* 3: X <-- H(X \xor B_i) */
+		blkxor(X, &Bin[i * 8 + 4], 64);
+		salsa20_8(X);
+
+		/* 4: Y_i <-- X */
+		/* 6: B' <-- (Y_0, Y_2 ... Y_{2r-2}, Y_1, Y_3 ... Y_{2r-1}) */
+		blkcpy(&Bout[(r + i) * 4], X, 64);
+	}
+}
+
+/**
+ * integerify(B, r):
+ * Return the result of parsing B_{2r-1} as a little-endian integer.
+ */
+static uint64_t
+integerify(const void * B, size_t r)
+{
+	const uint32_t * X = (const void *)((uintptr_t)(B) + (2 * r - 1) * 64);
+
+	/* Word 1 of the block is stored at position 13. */
+	return (((uint64_t)(X[13]) << 32) + X[0]);
+}
+
+/**
+ * smix(B, r, N, V, XY):
+ * Compute B = SMix_r(B, N).  The input B must be 128r bytes in length;
+ * the temporary storage V must be 128rN bytes in length; the temporary
+ * storage XY must be 256r + 64 bytes in length.  The value N must be a
+ * power of 2 greater than 1.  The arrays B, V, and XY must be aligned to a
+ * multiple of 64 bytes.
+ */
+static void
+smix(uint8_t * B, size_t r, uint64_t N, uint32_t * V, uint32_t * XY)
+{
+	__m128i * X = (__m128i *)XY;
+	__m128i * Y = (__m128i *)&XY[32 * r];
+	__m128i * Z = (__m128i *)&XY[64 * r];
+	__m128i * V128 = (__m128i *)V;
+	uint32_t * X32 = XY;
+	uint64_t i;
+	uint64_t j;
+	size_t k;
+
+	/* 1: X <-- B, with each block in SIMD order */
+	for (k = 0; k < 2 * r; k++) {
+		for (i = 0; i < 16; i++) {
+			X32[k * 16 + i] =
+			    le32dec(&B[(k * 16 + (i * 5 % 16)) * 4]);
+		}
+	}
+
+	/* 2: for i = 0 to N - 1 do */
+	for (i = 0; i < N; i += 2) {
+		/* 3: V_i <-- X */
+		blkcpy(&V128[i * (8 * r)], X, 128 * r);
+
+		/* 4: X <-- H(X) */
+		blockmix_salsa8(X, Y, Z, r);
+
+		/* 3: V_i <-- X */
+		blkcpy(&V128[(i + 1) * (8 * r)], Y, 128 * r);
+
+		/* 4: X <-- H(X) */
+		blockmix_salsa8(Y, X, Z, r);
+	}
+
+	/* 6: for i = 0 to N - 1 do */
+	for (i = 0; i < N; i += 2) {
+		/* 7: j <-- Integerify(X) mod N */
+		j = integerify(X, r) & (N - 1);
+
+		/* 8: X <-- H(X \xor V_j) */
+		blkxor(X, &V128[j * (8 * r)], 128 * r);
+		blockmix_salsa8(X, Y, Z, r);
+
+		/* 7: j <-- Integerify(X) mod N */
+		j = integerify(Y, r) & (N - 1);
+
+		/* 8: X <-- H(X \xor V_j) */
+		blkxor(Y, &V128[j * (8 * r)], 128 * r);
+		blockmix_salsa8(Y, X, Z, r);
+	}
+
+	/* 10: B' <-- X */
+	for (k = 0; k < 2 * r; k++) {
+		for (i = 0; i < 16; i++) {
+			le32enc(&B[(k * 16 + (i * 5 % 16)) * 4],
+			    X32[k * 16 + i]);
+		}
+	}
+}
+
+/*
+ * Three-way smix for N = 1024, r = 1, after pooler's scrypt_core_3way.
+ * salsa20/8 is one long chain of dependent SIMD operations; running three
+ * independent hashes through it side by side lets the CPU overlap them.
+ * Only the nonce scan uses it, as it always has more headers to hash.
+ */
+
+typedef union {
+	__m128i v[8];
+	uint32_t w[32];
+} scrypt_block;
+
+#define SALSA20_DOUBLEROUND(X0, X1, X2, X3) do {		\
+	__m128i T;						\
+	T = _mm_add_epi32(X0, X3);				\
+	X1 = _mm_xor_si128(X1, _mm_slli_epi32(T, 7));		\
+	X1 = _mm_xor_si128(X1, _mm_srli_epi32(T, 25));		\
+	T = _mm_add_epi32(X1, X0);				\
+	X2 = _mm_xor_si128(X2, _mm_slli_epi32(T, 9));		\
+	X2 = _mm_xor_si128(X2, _mm_srli_epi32(T, 23));		\
+	T = _mm_add_epi32(X2, X1);				\
+	X3 = _mm_xor_si128(X3, _mm_slli_epi32(T, 13));		\
+	X3 = _mm_xor_si128(X3, _mm_srli_epi32(T, 19));		\
+	T = _mm_add_epi32(X3, X2);				\
+	X0 = _mm_xor_si128(X0, _mm_slli_epi32(T, 18));		\
+	X0 = _mm_xor_si128(X0, _mm_srli_epi32(T, 14));		\
+	X1 = _mm_shuffle_epi32(X1, 0x93);			\
+	X2 = _mm_shuffle_epi32(X2, 0x4E);			\
+	X3 = _mm_shuffle_epi32(X3, 0x39);			\
+	T = _mm_add_epi32(X0, X1);				\
+	X3 = _mm_xor_si128(X3, _mm_slli_epi32(T, 7));		\
+	X3 = _mm_xor_si128(X3, _mm_srli_epi32(T, 25));		\
+	T = _mm_add_epi32(X3, X0);				\
+	X2 = _mm_xor_si128(X2, _mm_slli_epi32(T, 9));		\
+	X2 = _mm_xor_si128(X2, _mm_srli_epi32(T, 23));		\
+	T = _mm_add_epi32(X2, X3);				\
+	X1 = _mm_xor_si128(X1, _mm_slli_epi32(T, 13));		\
+	X1 = _mm_xor_si128(X1, _mm_srli_epi32(T, 19));		\
+	T = _mm_add_epi32(X1, X2);				\
+	X0 = _mm_xor_si128(X0, _mm_slli_epi32(T, 18));		\
+	X0 = _mm_xor_si128(X0, _mm_srli_epi32(T, 14));		\
+	X1 = _mm_shuffle_epi32(X1, 0x39);			\
+	X2 = _mm_shuffle_epi32(X2, 0x4E);			\
+	X3 = _mm_shuffle_epi32(X3, 0x93);			\
+} while (0)
+
+/**
+ * xor_salsa8_x3(X, d, s):
+ * For each of the three blocks, set the 64-byte half at d to
+ * salsa20_8(half d xor half s), where d and s are 0 or 4.
+ */
+static SCRYPT_INLINE void
+xor_salsa8_x3(scrypt_block X[3], size_t d, size_t s)
+{
+	__m128i A0, A1, A2, A3, B0, B1, B2, B3, C0, C1, C2, C3;
+	size_t i;
+
+	for (i = 0; i < 4; i++) {
+		X[0].v[d + i] = _mm_xor_si128(X[0].v[d + i], X[0].v[s + i]);
+		X[1].v[d + i] = _mm_xor_si128(X[1].v[d + i], X[1].v[s + i]);
+		X[2].v[d + i] = _mm_xor_si128(X[2].v[d + i], X[2].v[s + i]);
+	}
+	A0 = X[0].v[d]; A1 = X[0].v[d + 1]; A2 = X[0].v[d + 2]; A3 = X[0].v[d + 3];
+	B0 = X[1].v[d]; B1 = X[1].v[d + 1]; B2 = X[1].v[d + 2]; B3 = X[1].v[d + 3];
+	C0 = X[2].v[d]; C1 = X[2].v[d + 1]; C2 = X[2].v[d + 2]; C3 = X[2].v[d + 3];
+
+	for (i = 0; i < 8; i += 2) {
+		SALSA20_DOUBLEROUND(A0, A1, A2, A3);
+		SALSA20_DOUBLEROUND(B0, B1, B2, B3);
+		SALSA20_DOUBLEROUND(C0, C1, C2, C3);
+	}
+
+	X[0].v[d] = _mm_add_epi32(X[0].v[d], A0);
+	X[0].v[d + 1] = _mm_add_epi32(X[0].v[d + 1], A1);
+	X[0].v[d + 2] = _mm_add_epi32(X[0].v[d + 2], A2);
+	X[0].v[d + 3] = _mm_add_epi32(X[0].v[d + 3], A3);
+	X[1].v[d] = _mm_add_epi32(X[1].v[d], B0);
+	X[1].v[d + 1] = _mm_add_epi32(X[1].v[d + 1], B1);
+	X[1].v[d + 2] = _mm_add_epi32(X[1].v[d + 2], B2);
+	X[1].v[d + 3] = _mm_add_epi32(X[1].v[d + 3], B3);
+	X[2].v[d] = _mm_add_epi32(X[2].v[d], C0);
+	X[2].v[d + 1] = _mm_add_epi32(X[2].v[d + 1], C1);
+	X[2].v[d + 2] = _mm_add_epi32(X[2].v[d + 2], C2);
+	X[2].v[d + 3] = _mm_add_epi32(X[2].v[d + 3], C3);
+}
+
+/**
+ * smix_1024_1_x3(B, V):
+ * Compute B[l] = SMix_1(B[l], 1024) for l = 0, 1, 2.  Each B[l] is 128
+ * bytes; each V[l] is 128 KiB of temporary storage, aligned to 16 bytes.
+ */
+static void
+smix_1024_1_x3(uint8_t * B[3], __m128i * V[3])
+{
+	scrypt_block X[3];
+	uint32_t j;
+	size_t i, k, l;
+
+	/* 1: X <-- B, with each block in SIMD order */
+	for (l = 0; l < 3; l++) {
+		for (k = 0; k < 2; k++) {
+			for (i = 0; i < 16; i++) {
+				X[l].w[k * 16 + i] =
+				    le32dec(&B[l][(k * 16 + (i * 5 % 16)) * 4]);
+			}
+		}
+	}
+
+	/* 2: for i = 0 to N - 1 do */
+	for (i = 0; i < 1024; i++) {
+		/* 3: V_i <-- X */
+		for (l = 0; l < 3; l++)
+			blkcpy(&V[l][i * 8], X[l].v, 128);
+
+		/* 4: X <-- H(X) */
+		xor_salsa8_x3(X, 0, 4);
+		xor_salsa8_x3(X, 4, 0);
+	}
+
+	/* 6: for i = 0 to N - 1 do */
+	for (i = 0; i < 1024; i++) {
+		for (l = 0; l < 3; l++) {
+			/* 7: j <-- Integerify(X) mod N */
+			j = X[l].w[16] & 1023;
+
+			/* 8: X <-- H(X \xor V_j) */
+			blkxor(X[l].v, &V[l][j * 8], 128);
+		}
+		xor_salsa8_x3(X, 0, 4);
+		xor_salsa8_x3(X, 4, 0);
+	}
+
+	/* 10: B' <-- X */
+	for (l = 0; l < 3; l++) {
+		for (k = 0; k < 2; k++) {
+			for (i = 0; i < 16; i++) {
+				le32enc(&B[l][(k * 16 + (i * 5 % 16)) * 4],
+				    X[l].w[k * 16 + i]);
+			}
+		}
+	}
+}
+
+#else /* !SCRYPT_SSE2 */
+
 static void blkcpy(void *, const void *, size_t);
 static void blkxor(void *, const void *, size_t);
 static void salsa20_8(uint32_t[16]);
@@ -484,9 +854,9 @@ static void smix(uint8_t *, size_t, uint64_t, uint32_t *, uint32_t *);
 static void
 blkcpy(void * dest, const void * src, size_t len)
 {
-	size_t * D = dest;
-	const size_t * S = src;
-	size_t L = len / sizeof(size_t);
+	uint32_t * D = dest;
+	const uint32_t * S = src;
+	size_t L = len / sizeof(uint32_t);
 	size_t i;
 
 	for (i = 0; i < L; i++)
@@ -496,9 +866,9 @@ blkcpy(void * dest, const void * src, size_t len)
 static void
 blkxor(void * dest, const void * src, size_t len)
 {
-	size_t * D = dest;
-	const size_t * S = src;
-	size_t L = len / sizeof(size_t);
+	uint32_t * D = dest;
+	const uint32_t * S = src;
+	size_t L = len / sizeof(uint32_t);
 	size_t i;
 
 	for (i = 0; i < L; i++)
@@ -654,6 +1024,8 @@ smix(uint8_t * B, size_t r, uint64_t N, uint32_t * V, uint32_t * XY)
 		le32enc(&B[4 * k], X[k]);
 }
 
+#endif /* SCRYPT_SSE2 */
+
 /* cpu and memory intensive function to transform a 80 byte buffer into a 32 byte output
    scratchpad size needs to be at least 63 + (128 * r * p) + (256 * r + 64) + (128 * r * N) bytes
  */
@@ -691,3 +1063,78 @@ void scrypt_1024_1_1_256(const char* input, char* output)
 	scrypt_1024_1_1_256_sp(input, output, scratchpad);
 }
 
+/* 1 if the little-endian 256-bit hash is <= target */
+static int
+hash_le_target(const uint8_t * h, const uint8_t * t)
+{
+	int i;
+
+	/* compare from the most significant byte down */
+	for (i = 31; i > 0 && h[i] == t[i]; i--)
+		;
+	return h[i] <= t[i];
+}
+
+/* search nonces start <= nonce < stop (stop at most 2^32) for a hash of the 80 byte
+   header with that nonce in bytes 76..79 that is <= target, both hash and target being
+   little-endian 256-bit numbers. returns 1 and sets *nonce and output on the first hit,
+   0 if there is none. only the first 76 bytes of header are read.
+ */
+int scrypt_1024_1_1_256_scan(const char* header, uint64_t start, uint64_t stop,
+    const char* target, uint32_t* nonce, char* output)
+{
+	char scratchpad[131583];
+	char data[80];
+	uint64_t n = start;
+#ifdef SCRYPT_SSE2
+	/* three nonces at a time through smix_1024_1_x3 */
+	uint8_t data3[3][80];
+	uint8_t hash3[3][32];
+	uint8_t * B3[3];
+	__m128i * V3[3];
+	uint8_t * base;
+	char * scratchpad3 = NULL;
+	size_t l;
+
+	if (start < stop && stop - start >= 3)
+		scratchpad3 = malloc(63 + 3 * 128 + 3 * 128 * 1024);
+	if (scratchpad3 != NULL) {
+		base = (uint8_t *)(((uintptr_t)(scratchpad3) + 63) & ~ (uintptr_t)(63));
+		for (l = 0; l < 3; l++) {
+			memcpy(data3[l], header, 76);
+			B3[l] = base + l * 128;
+			V3[l] = (__m128i *)(base + 3 * 128 + l * 128 * 1024);
+		}
+		for (; n < stop && stop - n >= 3; n += 3) {
+			for (l = 0; l < 3; l++) {
+				le32enc(&data3[l][76], (uint32_t)(n + l));
+				PBKDF2_SHA256(data3[l], 80, data3[l], 80, 1, B3[l], 128);
+			}
+			smix_1024_1_x3(B3, V3);
+			for (l = 0; l < 3; l++)
+				PBKDF2_SHA256(data3[l], 80, B3[l], 128, 1, hash3[l], 32);
+
+			for (l = 0; l < 3; l++) {
+				if (hash_le_target(hash3[l], (const uint8_t *)target)) {
+					memcpy(output, hash3[l], 32);
+					*nonce = (uint32_t)(n + l);
+					free(scratchpad3);
+					return 1;
+				}
+			}
+		}
+		free(scratchpad3);
+	}
+#endif
+
+	memcpy(data, header, 76);
+	for (; n < stop; n++) {
+		le32enc(&data[76], (uint32_t)n);
+		scrypt_1024_1_1_256_sp(data, output, scratchpad);
+		if (hash_le_target((const uint8_t *)output, (const uint8_t *)target)) {
+			*nonce = (uint32_t)n;
+			return 1;
+		}
+	}
+	return 0;
+}
@@ -1,12 +1,16 @@
 #ifndef SCRYPT_H
 #define SCRYPT_H
 
+#include <stdint.h>
+
 #ifdef __cplusplus
 extern "C" {
 #endif
 
 void scrypt_1024_1_1_256(const char* input, char* output);
 void scrypt_1024_1_1_256_sp(const char* input, char* output, char* scratchpad);
+int scrypt_1024_1_1_256_scan(const char* header, uint64_t start, uint64_t stop,
+    const char* target, uint32_t* nonce, char* output);
 extern const int scrypt_scratchpad_size;
 
 #ifdef __cplusplus
@@ -32,8 +32,50 @@ static PyObject *scrypt_getpowhash(PyObject *self, PyObject *args)
     return value;
 }
 
+static PyObject *scrypt_scanhash(PyObject *self, PyObject *args)
+{
+    Py_buffer header, target;
+    unsigned long long start, stop;
+    uint32_t nonce;
+    char output[32];
+    int found;
+    (void)self;  /* required by Python C API convention */
+
+    if (!PyArg_ParseTuple(args, "y*KKy*", &header, &start, &stop, &target))
+        return NULL;
+
+    if (header.len != 80 || target.len != 32) {
+        PyBuffer_Release(&header);
+        PyBuffer_Release(&target);
+        PyErr_SetString(PyExc_ValueError, "Header must be 80 bytes and target 32 bytes");
+        return NULL;
+    }
+    if (stop > 0x100000000ULL)
+        stop = 0x100000000ULL;
+    if (start >= stop) {
+        PyBuffer_Release(&header);
+        PyBuffer_Release(&target);
+        Py_RETURN_NONE;
+    }
+
+    /* The whole run is spent in C, so let other threads in meanwhile */
+    Py_BEGIN_ALLOW_THREADS
+    found = scrypt_1024_1_1_256_scan((const char *)header.buf, start, stop,
+                                     (const char *)target.buf, &nonce, output);
+    Py_END_ALLOW_THREADS
+    PyBuffer_Release(&header);
+    PyBuffer_Release(&target);
+
+    if (!found)
+        Py_RETURN_NONE;
+    return Py_BuildValue("ky#", (unsigned long)nonce, output, (Py_ssize_t)32);
+}
+
 static PyMethodDef ScryptMethods[] = {
     { "getPoWHash", scrypt_getpowhash, METH_VARARGS, "Returns the proof of work hash using scrypt" },
+    { "scanHash", scrypt_scanhash, METH_VARARGS,
+      "scanHash(header, start, stop, target) -> (nonce, hash) for the first nonce in "
+      "[start, stop) whose scrypt hash is <= target (32 bytes, little-endian), or None" },
     { NULL, NULL, 0, NULL }
 };
 
@@ -1,9 +1,22 @@
-from distutils.core import setup, Extension
+import os
+import sys
+
+from setuptools import setup, Extension
+
+# scrypt.c picks its SSE2 salsa20/8 core whenever the target has SSE2.
+# LTC_SCRYPT_NATIVE=1 additionally tunes for the build machine's CPU
+# (-march=native); only use it when the module won't be copied elsewhere.
+extra_compile_args = []
+if sys.platform != 'win32':
+    extra_compile_args = ['-O3']
+    if os.environ.get('LTC_SCRYPT_NATIVE') == '1':
+        extra_compile_args.append('-march=native')
 
 ltc_scrypt_module = Extension('ltc_scrypt',
                                sources = ['scryptmodule_py3.c',
                                           'scrypt.c'],
-                               include_dirs=['.'])
+                               include_dirs=['.'],
+                               extra_compile_args=extra_compile_args)
 
 setup (name = 'ltc_scrypt',
        version = '1.0',
@@ -80,6 +80,30 @@ def test_scrypt():
             print("      got:      %s" % binascii.hexlify(result))
             failed += 1
 
+    # scanHash is only in the Python 3 binding
+    if hasattr(ltc_scrypt, 'scanHash'):
+        name, header_hex, expected_hex = TEST_VECTORS[0]
+        header = binascii.unhexlify(header_hex)
+        expected = binascii.unhexlify(expected_hex)
+        nonce = 2084524493
+        # Litecoin genesis target, nBits=0x1e0ffff0, as 32 little-endian bytes
+        target = b'\x00' * 27 + b'\xf0\xff\x0f' + b'\x00' * 2
+
+        if ltc_scrypt.scanHash(header, nonce - 3, nonce + 1, target) == (nonce, expected):
+            print("PASS: scanHash finds %s" % name)
+            passed += 1
+        else:
+            print("FAIL: scanHash did not find %s" % name)
+            failed += 1
+
+        # An empty range has no nonce to find, even against the easiest target
+        if ltc_scrypt.scanHash(header, 10, 5, b'\xff' * 32) is None:
+            print("PASS: scanHash of an empty range")
+            passed += 1
+        else:
+            print("FAIL: scanHash searched outside [start, stop)")
+            failed += 1
+
     print("")
     print("%d passed, %d failed" % (passed, failed))
     return failed == 0
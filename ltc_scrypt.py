@@ -38,22 +38,30 @@ def _load_c_ext():
         if not _hits:
             continue
 
-        # Python 2.7 / PyPy — imp.load_dynamic works for any .so
-        try:
-            import imp as _imp
-            return _imp.load_dynamic('ltc_scrypt', _hits[0])
-        except (ImportError, OSError):
-            pass
-
-        # Python 3.4+ — importlib (module name must match C's PyInit_ltc_scrypt)
+        # Python 3.4+ — importlib (module name must match C's PyInit_ltc_scrypt).
+        # imp is only touched where importlib.util doesn't exist: it warns
+        # on import since 3.4 and is gone in 3.12.
         try:
             import importlib.util as _ilu
-            _spec = _ilu.spec_from_file_location('ltc_scrypt', _hits[0])
-            _mod  = _ilu.module_from_spec(_spec)
-            _spec.loader.exec_module(_mod)
-            return _mod
-        except (ImportError, AttributeError, OSError):
-            pass
+        except ImportError:
+            _ilu = None
+
+        if _ilu is not None:
+            try:
+                _spec = _ilu.spec_from_file_location('ltc_scrypt', _hits[0])
+                _mod  = _ilu.module_from_spec(_spec)
+                _spec.loader.exec_module(_mod)
+                return _mod
+            except (ImportError, AttributeError, OSError):
+                pass
+
+        # Python 2.7 / PyPy — imp.load_dynamic works for any .so
+        else:
+            try:
+                import imp as _imp
+                return _imp.load_dynamic('ltc_scrypt', _hits[0])
+            except (ImportError, OSError):
+                pass
 
     return None
 
@@ -62,6 +70,9 @@ def _load_c_ext():
 _c_ext = _load_c_ext()
 if _c_ext is not None:
     getPoWHash = _c_ext.getPoWHash
+    # Nonce search loop, only in builds from scryptmodule_py3.c
+    if hasattr(_c_ext, 'scanHash'):
+        scanHash = _c_ext.scanHash
 
 # --- Priority 3: py-scrypt (Python 3, no compiled extension) ----------------
 else:
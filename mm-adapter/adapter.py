@@ -42,6 +42,7 @@ import argparse
 import asyncio
 import base64
 import hashlib
+import hmac
 import json
 import logging
 import struct
@@ -55,6 +56,21 @@ import aiohttp
 from aiohttp import web
 import yaml
 
+# orjson encodes straight to bytes and parses bytes without a decode step,
+# which matters for getblocktemplate's transaction lists; fall back to the
+# stdlib when it isn't installed
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    orjson = None
+    json_loads = json.loads
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -99,6 +115,12 @@ CHAIN_CONFIGS = {
     },
 }
 
+# Per-transaction fields of an auxpow template that P2Pool reads: 'data' to
+# assemble the block, 'hash' for the merkle root. 'txid' is kept alongside
+# 'hash' as the standard id; depends/fee/sigops/weight are dropped, so they
+# are neither stored nor re-encoded for every template served
+TEMPLATE_TX_FIELDS = ('data', 'txid', 'hash')
+
 
 class JsonRpcError(Exception):
     """JSON-RPC error from upstream daemon."""
@@ -126,23 +148,29 @@ class BlockTemplate:
     # Metadata
     fetched_at: float = field(default_factory=time.time)
     chainid: int = 0
+    longpoll_id: str = ''
 
 
 class UpstreamRPC:
     """JSON-RPC client for the upstream daemon."""
     
-    def __init__(self, url: str, user: str, password: str, timeout: int = 30):
+    def __init__(self, url: str, user: str, password: str, timeout: int = 30,
+                 max_connections: int = 4):
         self.url = url
         self.auth = aiohttp.BasicAuth(user, password)
         self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.max_connections = max_connections
         self._id = 0
         self._session: Optional[aiohttp.ClientSession] = None
     
-    async def _get_session(self) -> aiohttp.ClientSession:
+    def _get_session(self) -> aiohttp.ClientSession:
         """Get or create persistent HTTP session (connection pooling)."""
         if self._session is None or self._session.closed:
-            # keepalive_timeout=60 keeps TCP connection alive between calls
-            conn = aiohttp.TCPConnector(limit=4, keepalive_timeout=60)
+            # keepalive_timeout=60 keeps TCP connection alive between calls;
+            # the default of 4 connections matches the daemon's rpcthreads.
+            # The daemon's address is cached for as long as connections live.
+            conn = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60,
+                                        ttl_dns_cache=300)
             self._session = aiohttp.ClientSession(
                 auth=self.auth, timeout=self.timeout, connector=conn)
         return self._session
@@ -162,14 +190,16 @@ class UpstreamRPC:
             "params": list(params)
         }
         
-        log.debug(f"RPC -> {method}({params[:2]}{'...' if len(params) > 2 else ''})")
+        # %-style so the params (a whole block for submitblock) are only
+        # formatted when debug logging is on
+        log.debug("RPC -> %s(%s%s)", method, params[:2], '...' if len(params) > 2 else '')
         
-        session = await self._get_session()
-        async with session.post(self.url, json=payload) as resp:
+        session = self._get_session()
+        async with session.post(self.url, data=json_dumps(payload), headers=JSON_HEADERS) as resp:
             if resp.status == 401:
                 raise JsonRpcError(-1, "Authentication failed")
             
-            result = await resp.json()
+            result = json_loads(await resp.read())
             
             if result.get('error'):
                 err = result['error']
@@ -180,7 +210,11 @@ class UpstreamRPC:
                 )
             
             res = result.get('result')
-            log.debug(f"RPC <- {method}: {str(res)[:80]}{'...' if res and len(str(res)) > 80 else ''}")
+            # str() of a getblocktemplate result is tens of KB; only build
+            # it when it will be logged
+            if log.isEnabledFor(logging.DEBUG):
+                text = str(res)
+                log.debug(f"RPC <- {method}: {text[:80]}{'...' if len(text) > 80 else ''}")
             return res
     
     async def call_batch(self, calls: List[Tuple[str, List]]) -> List[Any]:
@@ -195,12 +229,12 @@ class UpstreamRPC:
                 "params": params
             })
         
-        session = await self._get_session()
-        async with session.post(self.url, json=batch) as resp:
+        session = self._get_session()
+        async with session.post(self.url, data=json_dumps(batch), headers=JSON_HEADERS) as resp:
             if resp.status == 401:
                 raise JsonRpcError(-1, "Authentication failed")
             
-            results = await resp.json()
+            results = json_loads(await resp.read())
             
             outputs = []
             for result in results:
@@ -233,6 +267,10 @@ class MultiAddressMergedMiningAdapter:
     # Default coinbase text for OP_RETURN
     DEFAULT_COINBASE_TEXT = "technocore"
     
+    # Longest a long-poll getblocktemplate waits before answering with the
+    # unchanged template (clients re-poll with the same longpollid)
+    LONGPOLL_TIMEOUT = 60.0
+    
     def __init__(self, config: Dict):
         self.config = config
         upstream = config['upstream']
@@ -240,7 +278,8 @@ class MultiAddressMergedMiningAdapter:
             f"http://{upstream['host']}:{upstream['port']}/",
             upstream['rpc_user'],
             upstream['rpc_password'],
-            upstream.get('timeout', 30)
+            upstream.get('timeout', 30),
+            upstream.get('max_connections', 4)
         )
         
         # Chain configuration
@@ -256,29 +295,71 @@ class MultiAddressMergedMiningAdapter:
         
         # Template cache
         self._current_template: Optional[BlockTemplate] = None
-        self._template_lock = asyncio.Lock()
+        # Cleared the first time the daemon rejects the segwit rule, so
+        # later fetches don't pay for a failing round-trip first
+        self._segwit_rules = True
+        # Bumped per installed template; with the tip hash it forms the
+        # longpollid. Long-poll callers wait on _template_changed, which is
+        # set (and replaced) whenever a new template is installed
+        self._template_epoch = 0
+        self._template_changed = asyncio.Event()
+        # Fetch started by a cache miss; concurrent misses wait on it
+        # instead of each asking the daemon for a template
+        self._pending_fetch: Optional[asyncio.Future] = None
+        # Last auxpow response built, as (template, coinbase_text, response);
+        # reused until the poller installs a new template
+        self._response_cache: Optional[Tuple[BlockTemplate, str, Dict]] = None
         
         # --- Cached state (updated by background poller) ---
         self.cached_tip_hash: Optional[str] = None       # getbestblockhash result
-        self.cached_response_time: float = 0             # When last built
+        self.cached_mempool: Optional[Tuple] = None      # getmempoolinfo (size, bytes)
+        self.cached_response_time: float = 0             # When last built (loop time)
         
         # Background poller settings
         poll_cfg = config.get('polling', {})
         self.poll_interval: float = poll_cfg.get('interval', 1.0)  # seconds
         self._poller_task: Optional[asyncio.Task] = None
         self._running = False
-        
-        # Stats
-        self.stats = {
-            'templates_served': 0,
-            'blocks_submitted': 0,
-            'blocks_accepted': 0,
-            'blocks_rejected': 0,
-            'last_template_time': None,
-            'last_submit_time': None,
-            'polls': 0,
-            'cache_hits': 0,
-            'cache_misses': 0,
+        # Event loop, set by initialize(); its monotonic clock times the cache
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Stats (plain attributes, bumped on every request; see stats)
+        self.templates_served = 0
+        self.blocks_submitted = 0
+        self.blocks_accepted = 0
+        self.blocks_rejected = 0
+        self.last_template_time: Optional[float] = None
+        self.last_submit_time: Optional[float] = None
+        self.polls = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Methods the adapter answers itself; everything else, including
+        # the info methods (getblockchaininfo, getblock, ...), is passed
+        # through to the daemon by handle_rpc_request
+        self._handlers = {
+            'getbestblockhash': self.handle_getbestblockhash,
+            'getblocktemplate': self.handle_getblocktemplate,
+            'submitblock': self.handle_submitblock,
+            'submitauxblock': self.handle_submitauxblock,
+            'getauxblock': self.handle_getauxblock,
+            'createauxblock': self.handle_createauxblock,
+            'getadapterstats': self.handle_getadapterstats,
+        }
+    
+    @property
+    def stats(self) -> Dict:
+        """Snapshot of the adapter counters, as reported by getadapterstats."""
+        return {
+            'templates_served': self.templates_served,
+            'blocks_submitted': self.blocks_submitted,
+            'blocks_accepted': self.blocks_accepted,
+            'blocks_rejected': self.blocks_rejected,
+            'last_template_time': self.last_template_time,
+            'last_submit_time': self.last_submit_time,
+            'polls': self.polls,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
         }
     
     # ---- Background poller ----
@@ -303,7 +384,7 @@ class MultiAddressMergedMiningAdapter:
         while self._running:
             try:
                 await self._refresh_template()
-                self.stats['polls'] += 1
+                self.polls += 1
             except Exception as e:
                 log.error(f"Poller error: {e}")
             await asyncio.sleep(self.poll_interval)
@@ -311,65 +392,88 @@ class MultiAddressMergedMiningAdapter:
     async def _refresh_template(self):
         """Fetch fresh template and update cache.
         
-        Optimization: first check getbestblockhash. If the tip hasn't
-        changed and cache is fresh (<5s), skip the expensive getblocktemplate.
-        Full refresh is forced every 5s for mempool freshness.
+        Optimization: first check getbestblockhash and getmempoolinfo (one
+        batch request). The expensive getblocktemplate is only re-run when
+        the tip changed, when the mempool changed and the cache is at least
+        5s old, or when the cache is 30s old (keeps curtime fresh).
         """
         FULL_REFRESH_INTERVAL = 5.0
+        MAX_TEMPLATE_AGE = 30.0
 
         try:
-            tip_hash = await self.rpc.call('getbestblockhash')
+            tip_hash, mempool_info = await self.rpc.call_batch(
+                [('getbestblockhash', []), ('getmempoolinfo', [])])
         except Exception:
+            tip_hash = mempool_info = None
+        if isinstance(tip_hash, JsonRpcError):
             tip_hash = None
+        # Unknown mempool state counts as changed
+        mempool = None
+        if isinstance(mempool_info, dict):
+            mempool = (mempool_info.get('size'), mempool_info.get('bytes'))
 
-        now = time.time()
+        now = self._loop.time()
+        age = now - self.cached_response_time
         tip_changed = (tip_hash != self.cached_tip_hash)
+        mempool_changed = (mempool is None or mempool != self.cached_mempool)
         needs_full = (tip_changed
                       or self._current_template is None
-                      or now - self.cached_response_time >= FULL_REFRESH_INTERVAL)
+                      or age >= MAX_TEMPLATE_AGE
+                      or (mempool_changed and age >= FULL_REFRESH_INTERVAL))
 
         if not needs_full:
             return  # Tip unchanged, cache fresh enough — skip heavy work
 
         # Fetch new template
         try:
-            try:
-                template_raw = await self.rpc.call('getblocktemplate', {'rules': ['segwit']})
-            except JsonRpcError as e:
-                if 'segwit' in str(e.message).lower():
+            if self._segwit_rules:
+                try:
+                    template_raw = await self.rpc.call('getblocktemplate', {'rules': ['segwit']})
+                except JsonRpcError as e:
+                    if 'segwit' not in str(e.message).lower():
+                        raise
+                    log.info("Upstream daemon rejects the segwit rule; requesting templates without it")
+                    self._segwit_rules = False
                     template_raw = await self.rpc.call('getblocktemplate')
-                else:
-                    raise
-
-            async with self._template_lock:
-                self._current_template = BlockTemplate(
-                    version=template_raw['version'],
-                    previous_block_hash=template_raw['previousblockhash'],
-                    transactions=template_raw.get('transactions', []),
-                    coinbase_value=template_raw.get('coinbasevalue', 0),
-                    target=template_raw.get('target', ''),
-                    bits=template_raw['bits'],
-                    cur_time=template_raw['curtime'],
-                    min_time=template_raw.get('mintime', template_raw['curtime']),
-                    height=template_raw.get('height', 0),
-                    mutable=template_raw.get('mutable', ['time', 'transactions', 'prevblock']),
-                    rules=template_raw.get('rules', []),
-                    chainid=self.chainid,
-                )
-                self.cached_tip_hash = tip_hash
-                self.cached_response_time = now
-                self.stats['last_template_time'] = now
+            else:
+                template_raw = await self.rpc.call('getblocktemplate')
+
+            # No await from here on: readers never see a half-updated cache
+            self._template_epoch += 1
+            self._current_template = BlockTemplate(
+                version=template_raw['version'],
+                previous_block_hash=template_raw['previousblockhash'],
+                transactions=[{k: tx[k] for k in TEMPLATE_TX_FIELDS if k in tx}
+                              for tx in template_raw.get('transactions', [])],
+                coinbase_value=template_raw.get('coinbasevalue', 0),
+                target=template_raw.get('target', ''),
+                bits=template_raw['bits'],
+                cur_time=template_raw['curtime'],
+                min_time=template_raw.get('mintime', template_raw['curtime']),
+                height=template_raw.get('height', 0),
+                mutable=template_raw.get('mutable', ['time', 'transactions', 'prevblock']),
+                rules=template_raw.get('rules', []),
+                chainid=self.chainid,
+                longpoll_id=f"{template_raw['previousblockhash']}{self._template_epoch}",
+            )
+            self._template_changed.set()
+            self._template_changed = asyncio.Event()
+            self.cached_tip_hash = tip_hash
+            self.cached_mempool = mempool
+            self.cached_response_time = now
+            self.last_template_time = time.time()
 
             if tip_changed:
                 log.info(f"[POLLER] New tip: {tip_hash[:16]}... height={self._current_template.height}")
             else:
-                log.debug(f"[POLLER] Refreshed template (mempool update)")
+                log.debug("[POLLER] Refreshed template (mempool update)")
 
         except Exception as e:
             log.error(f"[POLLER] Template fetch failed: {e}")
     
     async def initialize(self):
         """Initialize adapter - detect chain info."""
+        self._loop = asyncio.get_running_loop()
         try:
             # Get blockchain info to detect chain
             info = await self.rpc.call('getblockchaininfo')
@@ -407,20 +511,32 @@ class MultiAddressMergedMiningAdapter:
         
         Falls back to synchronous fetch if poller hasn't populated cache yet.
         """
-        async with self._template_lock:
-            if self._current_template is not None:
-                self.stats['cache_hits'] += 1
-                return self._current_template
-        
-        # Cache miss — first call before poller has run
-        self.stats['cache_misses'] += 1
-        log.debug("Template cache miss -- fetching synchronously")
-        await self._refresh_template()
-        
-        async with self._template_lock:
-            if self._current_template is None:
-                raise JsonRpcError(-1, "Failed to fetch block template")
-            return self._current_template
+        # The poller installs a finished template with a single assignment,
+        # so the common hit path can read it without any locking
+        template = self._current_template
+        if template is not None:
+            self.cache_hits += 1
+            return template
+        
+        # Cache miss — first call before poller has run. Only the first
+        # caller starts a fetch; the others join it
+        self.cache_misses += 1
+        fetch = self._pending_fetch
+        if fetch is None:
+            log.debug("Template cache miss -- fetching synchronously")
+            fetch = self._pending_fetch = asyncio.ensure_future(self._refresh_template())
+            fetch.add_done_callback(self._fetch_done)
+        # shield: a caller dropping its request doesn't cancel the fetch
+        # for everyone else waiting on it
+        await asyncio.shield(fetch)
+        
+        if self._current_template is None:
+            raise JsonRpcError(-1, "Failed to fetch block template")
+        return self._current_template
+    
+    def _fetch_done(self, fetch: asyncio.Future):
+        """Let the next cache miss start a new fetch."""
+        self._pending_fetch = None
     
     async def handle_getblocktemplate(self, params: List) -> Dict:
         """
@@ -438,14 +554,21 @@ class MultiAddressMergedMiningAdapter:
         5. Include that hash in parent chain (Litecoin) coinbase
         
         Coinbase text can be overridden per-request via params or uses config default.
+        
+        Long polling: a request carrying the 'longpollid' of the template
+        currently served waits until the poller installs a new one (or
+        LONGPOLL_TIMEOUT passes), so clients learn of new work without
+        polling.
         """
         # Check if this is an auxpow request
         capabilities = []
         coinbase_text_override = None
+        longpoll_id = None
         if params and isinstance(params[0], dict):
             capabilities = params[0].get('capabilities', [])
             # Allow caller to override coinbase text
             coinbase_text_override = params[0].get('coinbase_text')
+            longpoll_id = params[0].get('longpollid')
         
         if 'auxpow' not in capabilities:
             # Not a merged mining request - pass through
@@ -454,12 +577,25 @@ class MultiAddressMergedMiningAdapter:
         # Determine coinbase text: request override > config > default
         coinbase_text = coinbase_text_override or self.coinbase_text
         
-        log.debug(f"Handling merged mining getblocktemplate (multiaddress, coinbase_text='{coinbase_text}')")
+        log.debug("Handling merged mining getblocktemplate (multiaddress, coinbase_text='%s')",
+                  coinbase_text)
         
         # Get fresh template
         template = await self.get_block_template()
         
-        self.stats['templates_served'] += 1
+        if longpoll_id is not None and longpoll_id == template.longpoll_id:
+            # Every waiter holds the same Event, so one install wakes them all
+            try:
+                await asyncio.wait_for(self._template_changed.wait(), self.LONGPOLL_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+            template = self._current_template
+        
+        self.templates_served += 1
+        
+        cached = self._response_cache
+        if cached and cached[0] is template and cached[1] == coinbase_text:
+            return cached[2]
         
         # Build response in format P2Pool expects for multiaddress merged mining
         # Key: NO 'hash' in auxpow - P2Pool calculates this from custom coinbase
@@ -475,6 +611,7 @@ class MultiAddressMergedMiningAdapter:
             'height': template.height,
             'bits': template.bits,
             'rules': template.rules,
+            'longpollid': template.longpoll_id,
             
             # The auxpow object tells P2Pool this is auxpow-capable
             # but without a pre-computed hash - P2Pool builds its own
@@ -489,10 +626,11 @@ class MultiAddressMergedMiningAdapter:
             }
         }
         
-        log.debug(f"Serving template: height={template.height}, "
-                 f"coinbasevalue={template.coinbase_value}, "
-                 f"txs={len(template.transactions)}, chainid={self.chainid}")
+        log.debug("Serving template: height=%s, coinbasevalue=%s, txs=%s, chainid=%s",
+                  template.height, template.coinbase_value,
+                  len(template.transactions), self.chainid)
         
+        self._response_cache = (template, coinbase_text, response)
         return response
     
     async def handle_submitblock(self, params: List) -> Any:
@@ -513,8 +651,8 @@ class MultiAddressMergedMiningAdapter:
         block_hex = params[0]
         
         log.info(f"Submitting block: {len(block_hex)} hex chars")
-        self.stats['blocks_submitted'] += 1
-        self.stats['last_submit_time'] = time.time()
+        self.blocks_submitted += 1
+        self.last_submit_time = time.time()
         
         try:
             result = await self.rpc.call('submitblock', block_hex)
@@ -522,18 +660,18 @@ class MultiAddressMergedMiningAdapter:
             # submitblock returns null on success, error message on failure
             if result is None:
                 log.info("Block ACCEPTED by daemon!")
-                self.stats['blocks_accepted'] += 1
+                self.blocks_accepted += 1
                 # Trigger immediate template refresh after block acceptance
                 asyncio.ensure_future(self._refresh_template())
                 return None
             else:
                 log.warning(f"Block rejected: {result}")
-                self.stats['blocks_rejected'] += 1
+                self.blocks_rejected += 1
                 return result
                 
         except JsonRpcError as e:
             log.error(f"submitblock RPC error: {e}")
-            self.stats['blocks_rejected'] += 1
+            self.blocks_rejected += 1
             raise
     
     async def handle_submitauxblock(self, params: List) -> Any:
@@ -576,64 +714,35 @@ class MultiAddressMergedMiningAdapter:
             raise JsonRpcError(-1, "createauxblock requires address")
         return await self.rpc.call('createauxblock', params[0])
     
+    async def handle_getbestblockhash(self, params: List) -> Any:
+        """Return cached tip hash instantly (zero upstream cost)."""
+        if self.cached_tip_hash:
+            self.cache_hits += 1
+            return self.cached_tip_hash
+        return await self.rpc.call('getbestblockhash')
+    
+    async def handle_getadapterstats(self, params: List) -> Dict:
+        """Adapter stats (custom method)."""
+        return {
+            'chain': self.chain_name,
+            'chainid': self.chainid,
+            'coinbase_text': self.coinbase_text,
+            'stats': self.stats,
+            'mode': 'multiaddress',
+        }
+    
     async def handle_rpc_request(self, method: str, params: List) -> Any:
         """Route RPC requests to appropriate handlers."""
         
-        log.debug(f"Handling RPC: {method}")
-        
-        # Merged mining methods
-        if method == 'getbestblockhash':
-            # Return cached tip hash instantly (zero upstream cost)
-            if self.cached_tip_hash:
-                self.stats['cache_hits'] += 1
-                return self.cached_tip_hash
-            return await self.rpc.call('getbestblockhash')
-        
-        elif method == 'getblocktemplate':
-            return await self.handle_getblocktemplate(params)
-        
-        elif method == 'submitblock':
-            return await self.handle_submitblock(params)
+        log.debug("Handling RPC: %s", method)
         
-        elif method == 'submitauxblock':
-            return await self.handle_submitauxblock(params)
+        handler = self._handlers.get(method)
+        if handler is not None:
+            return await handler(params)
         
-        elif method == 'getauxblock':
-            return await self.handle_getauxblock(params)
-        
-        elif method == 'createauxblock':
-            return await self.handle_createauxblock(params)
-        
-        # Info methods - useful for debugging
-        elif method == 'getblockchaininfo':
-            return await self.rpc.call('getblockchaininfo')
-        
-        elif method == 'getnetworkinfo':
-            return await self.rpc.call('getnetworkinfo')
-        
-        elif method == 'getmininginfo':
-            return await self.rpc.call('getmininginfo')
-        
-        elif method == 'getblock':
-            return await self.rpc.call('getblock', *params)
-        
-        elif method == 'getblockhash':
-            return await self.rpc.call('getblockhash', *params)
-        
-        # Adapter stats (custom method)
-        elif method == 'getadapterstats':
-            return {
-                'chain': self.chain_name,
-                'chainid': self.chainid,
-                'coinbase_text': self.coinbase_text,
-                'stats': self.stats,
-                'mode': 'multiaddress',
-            }
-        
-        else:
-            # Pass through unknown methods
-            log.debug(f"Passing through: {method}")
-            return await self.rpc.call(method, *params)
+        # Pass through everything else
+        log.debug("Passing through: %s", method)
+        return await self.rpc.call(method, *params)
     
     async def close(self):
         """Cleanup resources."""
@@ -641,6 +750,11 @@ class MultiAddressMergedMiningAdapter:
         await self.rpc.close()
 
 
+def json_response(data: Any) -> web.Response:
+    """web.json_response, encoded with json_dumps."""
+    return web.Response(body=json_dumps(data), content_type='application/json')
+
+
 class RPCServer:
     """JSON-RPC server that accepts connections from P2Pool."""
     
@@ -650,21 +764,20 @@ class RPCServer:
         self.server_config = config['server']
         self._app: Optional[web.Application] = None
         self._runner: Optional[web.AppRunner] = None
+        # Last getblocktemplate result served and its encoding
+        self._encoded_template: Optional[Tuple[Dict, bytes]] = None
+        # Event loop, set by run(); times requests with its monotonic clock
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Authorization header a client with the configured credentials
+        # sends, as bytes so non-ASCII input can't trip compare_digest
+        credentials = f"{self.server_config['rpc_user']}:{self.server_config['rpc_password']}"
+        self._expected_auth = b'Basic ' + base64.b64encode(credentials.encode('utf-8'))
     
     def check_auth(self, request: web.Request) -> bool:
-        """Verify Basic auth credentials."""
+        """Verify Basic auth credentials (constant-time compare)."""
         auth_header = request.headers.get('Authorization', '')
-        if not auth_header.startswith('Basic '):
-            return False
-        
-        try:
-            encoded = auth_header[6:]
-            decoded = base64.b64decode(encoded).decode('utf-8')
-            user, password = decoded.split(':', 1)
-            return (user == self.server_config['rpc_user'] and 
-                    password == self.server_config['rpc_password'])
-        except:
-            return False
+        return hmac.compare_digest(auth_header.encode('utf-8', 'surrogateescape'),
+                                   self._expected_auth)
     
     async def handle_request(self, request: web.Request) -> web.Response:
         """Handle incoming JSON-RPC request."""
@@ -674,24 +787,43 @@ class RPCServer:
             return web.Response(status=401, text='Unauthorized')
         
         try:
-            body = await request.json()
-        except json.JSONDecodeError:
-            return web.json_response({
+            body = json_loads(await request.read())
+        except ValueError:
+            return json_response({
                 'jsonrpc': '1.0',
                 'id': None,
                 'result': None,
                 'error': {'code': -32700, 'message': 'Parse error'}
             })
         
-        # Handle batch requests
+        # Handle batch requests. aiohttp already serves separate requests
+        # concurrently; run the entries of a batch concurrently too, so e.g.
+        # several submissions share the upstream connection pool instead of
+        # waiting on each other. gather() keeps the responses in order.
         if isinstance(body, list):
-            responses = []
-            for req in body:
-                resp = await self._handle_single_request(req)
-                responses.append(resp)
-            return web.json_response(responses)
-        
-        return web.json_response(await self._handle_single_request(body))
+            responses = await asyncio.gather(
+                *(self._handle_single_request(req) for req in body))
+            return json_response(responses)
+        
+        response = await self._handle_single_request(body)
+        if body.get('method') == 'getblocktemplate' and response['result'] is not None:
+            return web.Response(body=self._encode_template_response(response),
+                                content_type='application/json')
+        return json_response(response)
+    
+    def _encode_template_response(self, response: Dict) -> bytes:
+        """Encode a getblocktemplate response, reusing the encoded result.
+        
+        The adapter returns the same result dict until the poller installs
+        a new template, so its transaction list is encoded once per
+        template instead of once per P2Pool poll.
+        """
+        result = response['result']
+        cached = self._encoded_template
+        if cached is None or cached[0] is not result:
+            cached = self._encoded_template = (result, json_dumps(result))
+        return b''.join((b'{"jsonrpc":"1.0","id":', json_dumps(response['id']),
+                         b',"result":', cached[1], b',"error":null}'))
     
     async def _handle_single_request(self, body: Dict) -> Dict:
         """Handle a single JSON-RPC request."""
@@ -699,14 +831,15 @@ class RPCServer:
         method = body.get('method', '')
         params = body.get('params', [])
         
-        start_time = time.time()
+        clock = self._loop.time
+        start_time = clock()
         
         try:
             result = await self.adapter.handle_rpc_request(method, params)
-            elapsed = (time.time() - start_time) * 1000
+            elapsed = (clock() - start_time) * 1000
             
             if method not in ('getblocktemplate',):  # Don't spam for frequent calls
-                log.debug(f"RPC {method}: OK ({elapsed:.1f}ms)")
+                log.debug("RPC %s: OK (%.1fms)", method, elapsed)
             
             return {
                 'jsonrpc': '1.0',
@@ -715,7 +848,7 @@ class RPCServer:
                 'error': None
             }
         except JsonRpcError as e:
-            elapsed = (time.time() - start_time) * 1000
+            elapsed = (clock() - start_time) * 1000
             log.warning(f"RPC {method}: Error {e.code} ({elapsed:.1f}ms)")
             return {
                 'jsonrpc': '1.0',
@@ -724,7 +857,7 @@ class RPCServer:
                 'error': {'code': e.code, 'message': e.message}
             }
         except Exception as e:
-            elapsed = (time.time() - start_time) * 1000
+            elapsed = (clock() - start_time) * 1000
             log.exception(f"RPC {method}: Exception ({elapsed:.1f}ms)")
             return {
                 'jsonrpc': '1.0',
@@ -735,12 +868,13 @@ class RPCServer:
     
     async def run(self):
         """Start the RPC server."""
+        self._loop = asyncio.get_running_loop()
         self._app = web.Application()
         self._app.router.add_post('/', self.handle_request)
         
         # Also handle GET for simple health check
         async def health_check(request):
-            return web.json_response({
+            return json_response({
                 'status': 'ok',
                 'mode': 'multiaddress',
                 'chain': self.adapter.chain_name,
@@ -751,7 +885,10 @@ class RPCServer:
         host = self.server_config['host']
         port = self.server_config['port']
         
-        self._runner = web.AppRunner(self._app)
+        # No aiohttp access log: every RPC is already logged (at debug
+        # level) by _handle_single_request, and P2Pool polls several times a
+        # second, so the access log only formatted a line per poll
+        self._runner = web.AppRunner(self._app, access_log=None)
         await self._runner.setup()
         
         site = web.TCPSite(self._runner, host, port)
@@ -863,6 +1000,14 @@ async def main():
 
 
 if __name__ == '__main__':
+    # uvloop's libuv-based event loop is a drop-in for asyncio's; use it
+    # where it's installed (it doesn't support Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -0,0 +1,34 @@
+"""pytest fixtures for test_adapter.py.
+
+The tests need a running adapter: set MM_ADAPTER_URL to its URL,
+credentials included (defaults to test_adapter.DEFAULT_URL). They are
+skipped when the adapter can't be reached.
+"""
+
+import os
+import socket
+
+import pytest
+
+import test_adapter
+
+
+@pytest.fixture(scope='session')
+def adapter_url():
+    return os.environ.get('MM_ADAPTER_URL', test_adapter.DEFAULT_URL)
+
+
+@pytest.fixture(scope='session')
+def rpc_results(adapter_url):
+    """Replies to test_adapter.TEST_CALLS, fetched once per session."""
+    (scheme, host, port), headers = test_adapter._prepare(adapter_url)
+    try:
+        socket.create_connection((host, port), timeout=3).close()
+    except OSError as e:
+        pytest.skip(f"adapter not reachable at {host}:{port}: {e}")
+    
+    results = test_adapter.make_rpc_batch(adapter_url, test_adapter.TEST_CALLS)
+    test_adapter.close_connections()
+    if all(result is None for result in results):
+        pytest.fail(f"batch request to {host}:{port} failed")
+    return results
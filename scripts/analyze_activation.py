@@ -6,67 +6,82 @@ Pure Python 3 - no p2pool imports, no twisted.
 Reimplements minimal binary parsing from p2pool's pack module.
 """
 
+import binascii
 import struct
-import io
 import os
 import sys
 import time
 import datetime
 import collections
+import concurrent.futures
+import mmap
+import array
 
 # ============================================================================
 # Minimal reimplementation of p2pool's pack types (Python 3)
 # ============================================================================
 
+# Every reader takes a memoryview and an integer cursor and returns
+# (value, new_pos): no BytesIO, and no bytes allocated per fixed-size field.
+
+# Precompiled so reads never re-parse a format string
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_U64 = struct.Struct('<Q')
+
+# VarInt marker byte -> (trailer size, trailer unpacker)
+_VARINT_TAIL = {
+    0xfd: (2, _U16.unpack_from),
+    0xfe: (4, _U32.unpack_from),
+    0xff: (8, _U64.unpack_from),
+}
+
 class VarIntType:
-    def read(self, f):
-        b = f.read(1)
-        if len(b) == 0:
+    def read(self, mv, pos):
+        if pos >= len(mv):
             raise EOFError()
-        first = b[0]
+        first = mv[pos]
+        pos += 1
         if first < 0xfd:
-            return first
-        if first == 0xfd:
-            return struct.unpack('<H', f.read(2))[0]
-        elif first == 0xfe:
-            return struct.unpack('<I', f.read(4))[0]
-        elif first == 0xff:
-            return struct.unpack('<Q', f.read(8))[0]
+            return first, pos
+        size, unpack_from = _VARINT_TAIL[first]
+        return unpack_from(mv, pos)[0], pos + size
 
 class VarStrType:
     _vi = VarIntType()
-    def read(self, f):
-        length = self._vi.read(f)
-        return f.read(length)
+    def read(self, mv, pos):
+        length, pos = self._vi.read(mv, pos)
+        return bytes(mv[pos:pos + length]), pos + length
 
 class IntType:
     def __init__(self, bits, endianness='little'):
         self.bytes = bits // 8
         self.little = (endianness == 'little')
 
-    def read(self, f):
+    def read(self, mv, pos):
         if self.bytes == 0:
-            return 0
-        data = f.read(self.bytes)
-        if len(data) < self.bytes:
+            return 0, pos
+        end = pos + self.bytes
+        if end > len(mv):
             raise EOFError()
-        return int.from_bytes(data, 'little' if self.little else 'big')
+        return int.from_bytes(mv[pos:end], 'little' if self.little else 'big'), end
 
 class FixedStrType:
     def __init__(self, length):
         self.length = length
-    def read(self, f):
-        return f.read(self.length)
+    def read(self, mv, pos):
+        return bytes(mv[pos:pos + self.length]), pos + self.length
 
 class StructType:
     def __init__(self, fmt):
         self.fmt = fmt
-        self.size = struct.calcsize(fmt)
-    def read(self, f):
-        data = f.read(self.size)
-        if len(data) < self.size:
+        self._st = struct.Struct(fmt)
+        self._unpack_from = self._st.unpack_from
+        self.size = self._st.size
+    def read(self, mv, pos):
+        if pos + self.size > len(mv):
             raise EOFError()
-        return struct.unpack(self.fmt, data)[0]
+        return self._unpack_from(mv, pos)[0], pos + self.size
 
 def make_int_type(bits, endianness='little'):
     """Factory matching p2pool's IntType behavior - small sizes use struct."""
@@ -80,57 +95,87 @@ class EnumType:
     def __init__(self, inner, mapping):
         self.inner = inner
         self.mapping = mapping
-    def read(self, f):
-        val = self.inner.read(f)
-        return self.mapping.get(val, 'unk%d' % val)
+        # Single-byte enums resolve with one tuple index, no .get()/format
+        if isinstance(inner, StructType) and inner.size == 1:
+            self.table = tuple(mapping.get(i, 'unk%d' % i) for i in range(256))
+        else:
+            self.table = None
+    def read(self, mv, pos):
+        if self.table is not None:
+            if pos >= len(mv):
+                raise EOFError()
+            return self.table[mv[pos]], pos + 1
+        val, pos = self.inner.read(mv, pos)
+        return self.mapping.get(val, 'unk%d' % val), pos
 
 class ListType:
     _vi = VarIntType()
     def __init__(self, item_type, mul=1, max_count=None):
         self.item_type = item_type
         self.mul = mul
-    def read(self, f):
-        length = self._vi.read(f) * self.mul
-        return [self.item_type.read(f) for _ in range(length)]
+        # Fixed-width ints (hash lists) are decoded in one comprehension
+        # over the view rather than one item_type.read() per element.
+        if isinstance(item_type, IntType) and item_type.bytes:
+            self.item_size = item_type.bytes
+            self.item_order = 'little' if item_type.little else 'big'
+        else:
+            self.item_size = None
+    def read(self, mv, pos):
+        length, pos = self._vi.read(mv, pos)
+        if self.item_size:
+            size, order = self.item_size, self.item_order
+            end = pos + length * self.mul * size
+            if end > len(mv):
+                raise EOFError()
+            return [int.from_bytes(mv[p:p + size], order) for p in range(pos, end, size)], end
+        result = []
+        for _ in range(length * self.mul):
+            item, pos = self.item_type.read(mv, pos)
+            result.append(item)
+        return result, pos
+
+_ZERO32 = bytes(32)
 
 class PossiblyNoneType:
     def __init__(self, none_value, inner):
         self.none_value = none_value
         self.inner = inner
-    def read(self, f):
-        value = self.inner.read(f)
-        return None if value == self.none_value else value
+        # Hash fields use 0 for None; compare the raw bytes against zeros
+        # before paying for a 256-bit int.
+        self.zero_is_none = (isinstance(inner, IntType) and inner.bytes == 32
+                             and none_value == 0)
+    def read(self, mv, pos):
+        if self.zero_is_none and mv[pos:pos + 32] == _ZERO32:
+            return None, pos + 32
+        value, pos = self.inner.read(mv, pos)
+        return (None if value == self.none_value else value), pos
 
 class ComposedType:
     def __init__(self, fields):
         self.fields = fields
-    def read(self, f):
+    def read(self, mv, pos):
         result = {}
         for name, typ in self.fields:
-            result[name] = typ.read(f)
-        return result
+            result[name], pos = typ.read(mv, pos)
+        return result, pos
+
+def bits_to_target(bits):
+    """Decode target from compact "bits" format."""
+    mantissa = bits & 0x00ffffff
+    exponent = bits >> 24
+    return mantissa * (256 ** (exponent - 3)) if exponent >= 3 else mantissa >> (8 * (3 - exponent))
 
 class FloatingIntegerType:
     _inner = make_int_type(32)
-    def read(self, f):
-        bits = self._inner.read(f)
-        # Decode target from compact "bits" format
-        mantissa = bits & 0x00ffffff
-        exponent = bits >> 24
-        target = mantissa * (256 ** (exponent - 3)) if exponent >= 3 else mantissa >> (8 * (3 - exponent))
-        return {'bits': bits, 'target': target}
+    def read(self, mv, pos):
+        bits, pos = self._inner.read(mv, pos)
+        return {'bits': bits, 'target': bits_to_target(bits)}, pos
 
 
 # ============================================================================
 # Share format definitions (matching p2pool/data.py)
 # ============================================================================
 
-# Outer wrapper: type_id varint + contents varstr
-outer_share_type = ComposedType([
-    ('type', VarIntType()),
-    ('contents', VarStrType()),
-])
-
 # small_block_header_type (same for V34-V36)
 small_block_header_type = ComposedType([
     ('version', VarIntType()),
@@ -153,83 +198,80 @@ merkle_link_type = ComposedType([
     ('index', IntType(0)),  # 0-bit int = always 0
 ])
 
+_STALE_INFO_NAMES = {0: None, 253: 'orphan', 254: 'doa'}
 stale_info_type = EnumType(
     make_int_type(8),
-    {k: {0: None, 253: 'orphan', 254: 'doa'}.get(k, 'unk%d' % k) for k in range(256)}
+    {k: _STALE_INFO_NAMES.get(k, 'unk%d' % k) for k in range(256)}
 )
 
 segwit_data_type = PossiblyNoneType(
     {'txid_merkle_link': {'branch': [], 'index': 0}, 'wtxid_merkle_root': 2**256 - 1},
-    ComposedType([
-        ('txid_merkle_link', ComposedType([
-            ('branch', ListType(IntType(256))),
-            ('index', IntType(0)),
-        ])),
+    ComposedType((
+        ('txid_merkle_link', merkle_link_type),
         ('wtxid_merkle_root', IntType(256)),
-    ])
+    ))
+)
+
+# Field groups shared by every share VERSION: built once here and
+# concatenated by make_share_info_type, so all versions reference the same
+# type instances instead of rebuilding identical sub-trees.
+_SHARE_DATA_HEAD = (
+    ('previous_share_hash', PossiblyNoneType(0, IntType(256))),
+    ('coinbase', VarStrType()),
+    ('nonce', make_int_type(32)),
+)
+_SHARE_DATA_ADDRESS = (('address', VarStrType()),)        # V34+
+_SHARE_DATA_PUBKEY_HASH = (('pubkey_hash', IntType(160)),)  # V33 and below
+_SHARE_DATA_TAIL = (
+    ('subsidy', make_int_type(64)),
+    ('donation', make_int_type(16)),
+    ('stale_info', stale_info_type),
+    ('desired_version', VarIntType()),
+)
+
+_INFO_SEGWIT = (('segwit_data', segwit_data_type),)
+_INFO_TX_HASHES = (
+    ('new_transaction_hashes', ListType(IntType(256))),
+    ('transaction_hash_refs', ListType(VarIntType(), 2)),
+)
+merged_address_entry = ComposedType((
+    ('chain_id', make_int_type(32)),
+    ('script', VarStrType()),
+))
+_INFO_MERGED_ADDRESSES = (
+    ('merged_addresses', PossiblyNoneType([], ListType(merged_address_entry, max_count=8))),
+)
+_INFO_TAIL = (
+    ('far_share_hash', PossiblyNoneType(0, IntType(256))),
+    ('max_bits', FloatingIntegerType()),
+    ('bits', FloatingIntegerType()),
+    ('timestamp', make_int_type(32)),
+    ('absheight', make_int_type(32)),
+    ('abswork', IntType(128)),
 )
 
 
 def make_share_info_type(version):
     """Build share_info_type for a given share VERSION."""
     
-    # share_data fields common to all
-    share_data_fields = [
-        ('previous_share_hash', PossiblyNoneType(0, IntType(256))),
-        ('coinbase', VarStrType()),
-        ('nonce', make_int_type(32)),
-    ]
-    
     # V34+ uses string address, older uses pubkey_hash
-    if version >= 34:
-        share_data_fields.append(('address', VarStrType()))
-    else:
-        share_data_fields.append(('pubkey_hash', IntType(160)))
-    
-    share_data_fields.extend([
-        ('subsidy', make_int_type(64)),
-        ('donation', make_int_type(16)),
-        ('stale_info', stale_info_type),
-        ('desired_version', VarIntType()),
-    ])
-    
-    share_data_type = ComposedType(share_data_fields)
-    
-    # Build share_info fields
-    info_fields = [('share_data', share_data_type)]
+    share_data_type = ComposedType(
+        _SHARE_DATA_HEAD
+        + (_SHARE_DATA_ADDRESS if version >= 34 else _SHARE_DATA_PUBKEY_HASH)
+        + _SHARE_DATA_TAIL
+    )
     
-    # V34+ has segwit_data (segwit activated for litecoin)
-    if version >= 34:
-        info_fields.append(('segwit_data', segwit_data_type))
+    info_fields = (('share_data', share_data_type),)
     
+    # V34+ has segwit_data (segwit activated for litecoin);
     # V33 and below have transaction hashes inline
-    if version < 34:
-        info_fields.extend([
-            ('new_transaction_hashes', ListType(IntType(256))),
-            ('transaction_hash_refs', ListType(VarIntType(), 2)),
-        ])
+    info_fields += _INFO_SEGWIT if version >= 34 else _INFO_TX_HASHES
     
     # V36 has merged_addresses after segwit_data
     if version >= 36:
-        merged_address_entry = ComposedType([
-            ('chain_id', make_int_type(32)),
-            ('script', VarStrType()),
-        ])
-        info_fields.append(('merged_addresses', PossiblyNoneType(
-            [],
-            ListType(merged_address_entry, max_count=8)
-        )))
-    
-    info_fields.extend([
-        ('far_share_hash', PossiblyNoneType(0, IntType(256))),
-        ('max_bits', FloatingIntegerType()),
-        ('bits', FloatingIntegerType()),
-        ('timestamp', make_int_type(32)),
-        ('absheight', make_int_type(32)),
-        ('abswork', IntType(128)),
-    ])
+        info_fields += _INFO_MERGED_ADDRESSES
     
-    return ComposedType(info_fields)
+    return ComposedType(info_fields + _INFO_TAIL)
 
 
 def make_inner_share_type(version):
@@ -254,6 +296,250 @@ for v in [17, 32, 33, 34, 35, 36]:
         print(f"  Warning: could not build parser for version {v}: {e}")
 
 
+# ============================================================================
+# Specialized parsers (generated per share VERSION)
+# ============================================================================
+#
+# Walking the type tree above costs one virtual .read() per field.  Instead,
+# compile_parser(v) walks a schema once and emits a flat Python function that
+# decodes the whole share with inline struct.unpack_from calls.  The result
+# is identical to INNER_TYPES[v].read() and, like it, parse() takes a
+# memoryview and returns (share, end_pos).
+#
+# Only META_PARSE[v] is built at import: the same parser restricted to
+# SHARE_META_FIELDS, where every other field is skipped by advancing pos, so
+# merkle branches, coinbase, segwit data etc. are never materialized.
+
+# VarInt marker byte -> total encoded size, for skipping varints unread
+_VARINT_SKIP = tuple(1 + {0xfd: 2, 0xfe: 4, 0xff: 8}.get(b, 0) for b in range(256))
+
+# Dotted paths of the fields load_all_shares actually uses
+SHARE_META_FIELDS = (
+    'share_info.share_data.previous_share_hash',
+    'share_info.share_data.address',
+    'share_info.share_data.pubkey_hash',
+    'share_info.share_data.subsidy',
+    'share_info.share_data.donation',
+    'share_info.share_data.stale_info',
+    'share_info.share_data.desired_version',
+    'share_info.max_bits',
+    'share_info.bits',
+    'share_info.timestamp',
+    'share_info.absheight',
+)
+
+
+def fixed_size(typ):
+    """Encoded size of typ if it does not depend on the data, else None."""
+    if isinstance(typ, StructType):
+        return typ.size
+    if isinstance(typ, IntType):
+        return typ.bytes
+    if isinstance(typ, FixedStrType):
+        return typ.length
+    if isinstance(typ, FloatingIntegerType):
+        return typ._inner.size
+    if isinstance(typ, (EnumType, PossiblyNoneType)):
+        return fixed_size(typ.inner)
+    if isinstance(typ, ComposedType):
+        sizes = [fixed_size(sub) for _, sub in typ.fields]
+        return None if None in sizes else sum(sizes)
+    return None
+
+class _ParserBuilder:
+    """Emit straight-line Python source for a type tree."""
+
+    def __init__(self):
+        self.lines = []
+        self.ns = {'_from_bytes': int.from_bytes, '_bits_to_target': bits_to_target,
+                   '_VARINT_TAIL': _VARINT_TAIL, '_VARINT_SKIP': _VARINT_SKIP,
+                   '_ZERO32': _ZERO32}
+        self._n = 0
+        self._skip = None  # pending (depth, nbytes) of coalesced fixed skips
+
+    def tmp(self):
+        self._n += 1
+        return '_v%d' % self._n
+
+    def const(self, value):
+        name = '_c%d' % len(self.ns)
+        self.ns[name] = value
+        return name
+
+    def unpacker(self, st):
+        name = '_S_' + ''.join(c if c.isalnum() else '_' for c in st.format)
+        self.ns[name] = st.unpack_from
+        return name
+
+    def line(self, depth, text):
+        self.flush()
+        self.lines.append('    ' * depth + text)
+
+    def flush(self):
+        if self._skip:
+            depth, nbytes = self._skip
+            self._skip = None
+            self.line(depth, 'pos += %d' % nbytes)
+
+    def skip(self, typ, depth):
+        """Emit code that advances pos past typ without decoding it."""
+        size = fixed_size(typ)
+        if size is not None:
+            if size:
+                if self._skip and self._skip[0] == depth:
+                    size += self._skip[1]
+                else:
+                    self.flush()
+                self._skip = (depth, size)
+        elif isinstance(typ, VarIntType):
+            self.line(depth, 'pos += _VARINT_SKIP[buf[pos]]')
+        elif isinstance(typ, VarStrType):
+            n = self.tmp()
+            self.emit_varint(n, depth)
+            self.line(depth, 'pos += %s' % n)
+        elif isinstance(typ, (EnumType, PossiblyNoneType)):
+            self.skip(typ.inner, depth)
+        elif isinstance(typ, ListType):
+            n = self.tmp()
+            self.emit_varint(n, depth)
+            item_size = fixed_size(typ.item_type)
+            if item_size is not None:
+                self.line(depth, 'pos += %s * %d' % (n, item_size * typ.mul))
+            else:
+                self.line(depth, 'for _ in range(%s * %d):' % (n, typ.mul))
+                self.skip(typ.item_type, depth + 1)
+                self.flush()
+        elif isinstance(typ, ComposedType):
+            for _, sub in typ.fields:
+                self.skip(sub, depth)
+        else:
+            raise TypeError('no code generator for %s' % type(typ).__name__)
+
+    def emit_fields(self, typ, dst, depth, wanted, prefix=''):
+        """Like emit(), but only decode the dotted paths in wanted."""
+        names = []
+        for name, sub in typ.fields:
+            path = prefix + name
+            if path in wanted:
+                t = self.tmp()
+                self.emit(sub, t, depth)
+                names.append((name, t))
+            elif isinstance(sub, ComposedType) and any(w.startswith(path + '.') for w in wanted):
+                t = self.tmp()
+                self.emit_fields(sub, t, depth, wanted, path + '.')
+                names.append((name, t))
+            else:
+                self.skip(sub, depth)
+        self.line(depth, '%s = {%s}' % (dst, ', '.join('%r: %s' % nt for nt in names)))
+
+    def emit_varint(self, dst, depth):
+        self.line(depth, '%s = buf[pos]; pos += 1' % dst)
+        self.line(depth, 'if %s >= 0xfd:' % dst)
+        self.line(depth + 1, '_size, _unpack = _VARINT_TAIL[%s]; %s, = _unpack(buf, pos); pos += _size' % (dst, dst))
+
+    def emit(self, typ, dst, depth):
+        if isinstance(typ, VarIntType):
+            self.emit_varint(dst, depth)
+        elif isinstance(typ, VarStrType):
+            n = self.tmp()
+            self.emit_varint(n, depth)
+            self.line(depth, '%s = bytes(buf[pos:pos + %s]); pos += %s' % (dst, n, n))
+        elif isinstance(typ, StructType):
+            self.line(depth, '%s, = %s(buf, pos); pos += %d' % (dst, self.unpacker(typ._st), typ.size))
+        elif isinstance(typ, IntType):
+            if typ.bytes == 0:
+                self.line(depth, '%s = 0' % dst)
+            else:
+                self.line(depth, "%s = _from_bytes(buf[pos:pos + %d], '%s'); pos += %d" % (
+                    dst, typ.bytes, 'little' if typ.little else 'big', typ.bytes))
+        elif isinstance(typ, FixedStrType):
+            self.line(depth, '%s = bytes(buf[pos:pos + %d]); pos += %d' % (dst, typ.length, typ.length))
+        elif isinstance(typ, FloatingIntegerType):
+            b = self.tmp()
+            self.emit(typ._inner, b, depth)
+            self.line(depth, "%s = {'bits': %s, 'target': _bits_to_target(%s)}" % (dst, b, b))
+        elif isinstance(typ, EnumType) and typ.table is not None:
+            self.line(depth, '%s = %s[buf[pos]]; pos += 1' % (dst, self.const(typ.table)))
+        elif isinstance(typ, EnumType):
+            self.emit(typ.inner, dst, depth)
+            m = self.const(typ.mapping)
+            self.line(depth, "%s = %s[%s] if %s in %s else 'unk%%d' %% %s" % (dst, m, dst, dst, m, dst))
+        elif isinstance(typ, PossiblyNoneType):
+            if typ.zero_is_none:
+                self.line(depth, 'if buf[pos:pos + 32] == _ZERO32:')
+                self.line(depth + 1, '%s = None; pos += 32' % dst)
+                self.line(depth, 'else:')
+                self.emit(typ.inner, dst, depth + 1)
+            else:
+                self.emit(typ.inner, dst, depth)
+                self.line(depth, 'if %s == %s: %s = None' % (dst, self.const(typ.none_value), dst))
+        elif isinstance(typ, ListType):
+            n = self.tmp()
+            self.emit_varint(n, depth)
+            if typ.mul != 1:
+                self.line(depth, '%s *= %d' % (n, typ.mul))
+            if typ.item_size:
+                size = typ.item_size
+                self.line(depth, "%s = [_from_bytes(buf[p:p + %d], '%s') for p in range(pos, pos + %s * %d, %d)]" % (
+                    dst, size, typ.item_order, n, size, size))
+                self.line(depth, 'pos += %s * %d' % (n, size))
+            else:
+                i = self.tmp()
+                self.line(depth, '%s = []' % dst)
+                self.line(depth, 'for %s in range(%s):' % (i, n))
+                self.emit(typ.item_type, i, depth + 1)
+                self.line(depth + 1, '%s.append(%s)' % (dst, i))
+        elif isinstance(typ, ComposedType):
+            names = []
+            for name, sub in typ.fields:
+                t = self.tmp()
+                self.emit(sub, t, depth)
+                names.append((name, t))
+            self.line(depth, '%s = {%s}' % (dst, ', '.join('%r: %s' % nt for nt in names)))
+        else:
+            raise TypeError('no code generator for %s' % type(typ).__name__)
+
+
+def build_parser_source(version, fields=None):
+    """Return (source, namespace) for a flat parser of the given share VERSION.
+
+    With fields (dotted paths), only those are decoded and the rest skipped.
+    """
+    b = _ParserBuilder()
+    b.line(0, 'def parse(buf, pos=0):')
+    if fields is None:
+        b.emit(INNER_TYPES[version], 'share', 1)
+    else:
+        b.emit_fields(INNER_TYPES[version], 'share', 1, frozenset(fields))
+    b.line(1, 'if pos > len(buf):')
+    b.line(2, 'raise EOFError()')
+    b.line(1, 'return share, pos')
+    return '\n'.join(b.lines) + '\n', b.ns
+
+
+def compile_parser(version, fields=None):
+    src, ns = build_parser_source(version, fields)
+    exec(compile(src, '<share parser v%d>' % version, 'exec'), ns)
+    return ns['parse']
+
+
+META_PARSE = {v: compile_parser(v, SHARE_META_FIELDS) for v in INNER_TYPES}
+
+
+_varint = VarIntType()
+
+def split_share(data_bin):
+    """Split a serialized share into (type, contents view) without copying.
+
+    The outer wrapper is a type_id varint followed by the contents as a
+    varstr; the contents are returned as a memoryview slice ready for META_PARSE.
+    """
+    mv = memoryview(data_bin)
+    share_version, pos = _varint.read(mv, 0)
+    length, pos = _varint.read(mv, pos)
+    return share_version, mv[pos:pos + length]
+
+
 # ============================================================================
 # Helper functions
 # ============================================================================
@@ -275,93 +561,157 @@ CHAIN_LENGTH = 24 * 60 * 60 // 10  # 8640 shares
 # Share loading
 # ============================================================================
 
-def load_all_shares(share_dir):
-    """Load all shares from share store files."""
+class Share:
+    """The fields of one parsed share that the analyses use.
+
+    Slotted rather than a dict: a chain holds thousands of these, and slots
+    keep each one small and its attribute reads cheap.
+    """
+
+    __slots__ = ('id', 'version', 'desired_version', 'address', 'addr_id',
+                 'target', 'weight', 'max_target', 'timestamp', 'absheight',
+                 'previous_share_hash', 'subsidy', 'donation', 'stale_info')
+
+
+def parse_file(fpath):
+    """Parse one shares.N file.
+
+    Returns (share_objs, errors, messages): share_objs in file order, the
+    error count, and the first few error messages for the caller to print.
+    Runs in a worker process, so addresses are left as plain strings and
+    interned by the caller.
+    """
+    fname = os.path.basename(fpath)
+    share_objs = []
+    errors = 0
+    messages = []
+    with open(fpath, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        # Scan the mapped file in place: lines are located with find()
+        # and the hex payload is decoded from a view, so no per-line
+        # bytes objects are allocated for the (large) share lines.
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        mv = memoryview(mm)
+        pos = 0
+        line_no = 0
+        while pos < size:
+            start = pos
+            stop = mm.find(b'\n', pos)
+            if stop < 0:
+                stop = size
+            pos = stop + 1
+            line_no += 1
+            # Share lines are written as "<type> <hex>"; anything not starting
+            # with "5 " (verified hashes are type 2, blank lines) is skipped
+            # on two byte compares, before any slicing or int parsing.
+            if stop - start < 2 or mm[start] != 0x35 or mm[start + 1] != 0x20:
+                continue
+            while mm[stop - 1] in b' \t\r':
+                stop -= 1
+            try:
+                # unhexlify reads the mapped bytes directly; no str round trip
+                data_bin = binascii.unhexlify(mv[start + 2:stop])
+                
+                # Parse outer wrapper: type (varint) + contents (varstr)
+                share_version, contents = split_share(data_bin)
+                
+                parse = META_PARSE.get(share_version)
+                if parse is None:
+                    continue
+                
+                # Parse inner share
+                try:
+                    inner, _ = parse(contents)
+                except Exception:
+                    errors += 1
+                    continue
+                
+                share_data = inner['share_info']['share_data']
+                share_info = inner['share_info']
+                
+                # Extract address
+                if share_version >= 34:
+                    address = share_data['address'].decode('ascii', errors='replace')
+                else:
+                    address = 'pubkey_hash:%x' % share_data.get('pubkey_hash', 0)
+                
+                bits_target = share_info['bits']['target']
+                
+                share_obj = Share()
+                share_obj.id = share_obj.absheight = share_info['absheight']
+                share_obj.version = share_version
+                share_obj.desired_version = share_data['desired_version']
+                share_obj.address = address
+                share_obj.target = bits_target
+                share_obj.weight = target_to_average_attempts(bits_target)
+                share_obj.max_target = share_info['max_bits']['target']
+                share_obj.timestamp = share_info['timestamp']
+                share_obj.previous_share_hash = share_data['previous_share_hash']
+                share_obj.subsidy = share_data['subsidy']
+                share_obj.donation = share_data['donation']
+                share_obj.stale_info = share_data['stale_info']
+                share_objs.append(share_obj)
+                
+            except Exception as e:
+                errors += 1
+                if errors <= 3:
+                    messages.append(f"    Error in {fname}:{line_no}: {e}")
+        mv.release()
+        if size:
+            mm.close()
+    return share_objs, errors, messages
+
+
+def load_all_shares(share_dir, jobs=None):
+    """Load all shares from share store files.
+
+    Files are parsed in parallel by up to `jobs` worker processes (default:
+    one per CPU; 1 parses in-process). Returns (shares, addresses): shares
+    maps absheight to a Share whose addr_id indexes the interned addresses
+    list.
+    """
     shares = {}
+    addr_to_id = {}
+    addresses = []
     files = sorted(
         [f for f in os.listdir(share_dir) if f.startswith('shares.') and f[7:].isdigit()],
         key=lambda f: int(f[7:])
     )
+    paths = [os.path.join(share_dir, fname) for fname in files]
+    
+    if jobs == 1 or len(paths) < 2:
+        results = map(parse_file, paths)
+        executor = None
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+        results = executor.map(parse_file, paths)
     
     total_errors = 0
-    for fname in files:
-        fpath = os.path.join(share_dir, fname)
-        count = 0
-        errors = 0
-        with open(fpath, 'rb') as f:
-            for line_no, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    parts = line.split(b' ', 1)
-                    type_id = int(parts[0])
-                    
-                    if type_id != 5:
-                        continue  # skip verified hashes (type 2) and others
-                    
-                    data_hex = parts[1]
-                    data_bin = bytes.fromhex(data_hex.decode('ascii'))
-                    
-                    # Parse outer wrapper: type (varint) + contents (varstr)
-                    bio = io.BytesIO(data_bin)
-                    outer = outer_share_type.read(bio)
-                    share_version = outer['type']
-                    contents_bin = outer['contents']
-                    
-                    if share_version not in INNER_TYPES:
-                        continue
-                    
-                    # Parse inner share
-                    inner_bio = io.BytesIO(contents_bin)
-                    try:
-                        inner = INNER_TYPES[share_version].read(inner_bio)
-                    except Exception:
-                        errors += 1
-                        continue
-                    
-                    share_data = inner['share_info']['share_data']
-                    share_info = inner['share_info']
-                    
-                    # Extract address
-                    if share_version >= 34:
-                        address = share_data['address'].decode('ascii', errors='replace')
-                    else:
-                        address = 'pubkey_hash:%x' % share_data.get('pubkey_hash', 0)
-                    
-                    bits_target = share_info['bits']['target']
-                    
-                    share_obj = {
-                        'version': share_version,
-                        'desired_version': share_data['desired_version'],
-                        'address': address,
-                        'target': bits_target,
-                        'max_target': share_info['max_bits']['target'],
-                        'timestamp': share_info['timestamp'],
-                        'absheight': share_info['absheight'],
-                        'previous_share_hash': share_data['previous_share_hash'],
-                        'subsidy': share_data['subsidy'],
-                        'donation': share_data['donation'],
-                        'stale_info': share_data['stale_info'],
-                    }
-                    
-                    share_id = share_info['absheight']
-                    share_obj['id'] = share_id
-                    
-                    # Keep latest version if duplicate absheight (shouldn't happen on valid chain)
-                    shares[share_id] = share_obj
-                    count += 1
-                    
-                except Exception as e:
-                    errors += 1
-                    if errors <= 3:
-                        print(f"    Error in {fname}:{line_no}: {e}")
-        
-        total_errors += errors
-        print(f"  {fname}: {count} shares loaded ({errors} errors)")
+    try:
+        # map() yields in file order, so later files still win on duplicates
+        for fname, (share_objs, errors, messages) in zip(files, results):
+            for message in messages:
+                print(message)
+            for share_obj in share_objs:
+                # Intern the address: one string per miner, int ids as keys
+                address = share_obj.address
+                addr_id = addr_to_id.get(address)
+                if addr_id is None:
+                    addr_id = addr_to_id[address] = len(addresses)
+                    addresses.append(address)
+                share_obj.address = addresses[addr_id]
+                share_obj.addr_id = addr_id
+                # Keep latest version if duplicate absheight (shouldn't happen on valid chain)
+                shares[share_obj.id] = share_obj
+            
+            total_errors += errors
+            print(f"  {fname}: {len(share_objs)} shares loaded ({errors} errors)")
+    finally:
+        if executor is not None:
+            executor.shutdown()
     
     print(f"\nTotal: {len(shares)} unique shares loaded ({total_errors} errors)")
-    return shares
+    return shares, addresses
 
 
 def build_chain(shares):
@@ -397,198 +747,254 @@ def build_chain(shares):
     return sorted_heights  # newest first (tip at index 0)
 
 
-def analyze_activation_window(shares, chain):
-    """Analyze the activation window (positions 7776-8640 from tip = oldest 10%)."""
-    window_start = CHAIN_LENGTH * 9 // 10  # 7776
-    window_size = CHAIN_LENGTH // 10        # 864
+class ShareColumns:
+    """The chain as parallel typed columns (struct-of-arrays), tip first.
+
+    Row i is the share at position i from the tip, so activation windows
+    and segments are plain index ranges and min/max reductions over a
+    column slice run in C instead of chasing one dict per share.
+    """
+
+    def __init__(self, shares, chain, addresses):
+        rows = [shares[h] for h in chain]
+        self.absheight = array.array('q', chain)
+        self.version = array.array('Q', [s.version for s in rows])
+        self.desired_version = array.array('Q', [s.desired_version for s in rows])
+        self.timestamp = array.array('Q', [s.timestamp for s in rows])
+        # 256-bit values, no typecode fits
+        self.target = [s.target for s in rows]
+        self.weight = [s.weight for s in rows]
+        self.address_id = array.array('L', [s.addr_id for s in rows])
+        self.addresses = addresses
+
+    def __len__(self):
+        return len(self.absheight)
+
+
+WINDOW_START = CHAIN_LENGTH * 9 // 10  # 7776
+WINDOW_SIZE = CHAIN_LENGTH // 10        # 864
+SEGMENT_SIZE = CHAIN_LENGTH // 10       # 864
+
+
+class ChainStats:
+    """Everything the reports need, accumulated by analyze_all()."""
+
+    def __init__(self, n):
+        self.n = n
+        # Activation window (clipped to the chain if it is too short)
+        self.window_start = min(WINDOW_START, n)
+        self.window_end = min(WINDOW_START + WINDOW_SIZE, n)
+        self.version_weights = collections.defaultdict(float)
+        self.miner_version_weights = collections.defaultdict(float)
+        self.version_counts = collections.Counter()
+        self.miner_version_counts = collections.Counter()
+        self.share_type_counts = collections.Counter()
+        self.window_weight = 0.0
+        self.window_v36_weight = 0.0
+        self.window_first_v35 = None
+        # [v35, v36, other] weight per segment
+        self.segment_weights = [[0.0, 0.0, 0.0] for _ in range(0, n, SEGMENT_SIZE)]
+        # Row indices of v35/v36-voting shares, grouped by address id
+        self.v35_by_addr = collections.defaultdict(list)
+        self.v36_by_addr = collections.defaultdict(list)
+
+
+def analyze_all(cols):
+    """Accumulate the window, segment and per-version stats in one pass."""
+    st = ChainStats(len(cols))
+    window_start, window_end = st.window_start, st.window_end
+    rows = zip(cols.desired_version, cols.weight, cols.address_id)
+    for i, (dv, w, aid) in enumerate(rows):
+        seg = st.segment_weights[i // SEGMENT_SIZE]
+        if dv == 35:
+            seg[0] += w
+            st.v35_by_addr[aid].append(i)
+        elif dv == 36:
+            seg[1] += w
+            st.v36_by_addr[aid].append(i)
+        else:
+            seg[2] += w
+        
+        if window_start <= i < window_end:
+            st.version_weights[dv] += w
+            st.miner_version_weights[(aid, dv)] += w
+            st.window_weight += w
+            if dv == 36:
+                st.window_v36_weight += w
+            elif dv == 35 and st.window_first_v35 is None:
+                st.window_first_v35 = i
+    
+    # Window share counts are plain histograms over column slices, which
+    # Counter tallies in C rather than one dict update per row above.
+    window_dvs = cols.desired_version[window_start:window_end]
+    st.version_counts.update(window_dvs)
+    st.share_type_counts.update(cols.version[window_start:window_end])
+    st.miner_version_counts.update(zip(cols.address_id[window_start:window_end], window_dvs))
+    return st
+
+
+def report_activation_window(cols, st):
+    """Report on the activation window (positions 7776-8640 from tip = oldest 10%)."""
+    n = st.n
     
     print("\n" + "=" * 80)
     print("ACTIVATION WINDOW ANALYSIS")
     print("=" * 80)
-    print(f"Chain length: {len(chain)}  (CHAIN_LENGTH={CHAIN_LENGTH})")
-    print(f"Window: positions {window_start} to {window_start + window_size - 1} from tip (oldest 10%)")
-    
-    if len(chain) < window_start + window_size:
-        print(f"WARNING: Chain too short! Need {window_start + window_size}, have {len(chain)}")
-        actual_end = min(window_start + window_size, len(chain))
-        actual_start = min(window_start, len(chain))
-        window_heights = chain[actual_start:actual_end]
-    else:
-        window_heights = chain[window_start:window_start + window_size]
+    print(f"Chain length: {n}  (CHAIN_LENGTH={CHAIN_LENGTH})")
+    print(f"Window: positions {WINDOW_START} to {WINDOW_START + WINDOW_SIZE - 1} from tip (oldest 10%)")
     
-    if not window_heights:
+    if n < WINDOW_START + WINDOW_SIZE:
+        print(f"WARNING: Chain too short! Need {WINDOW_START + WINDOW_SIZE}, have {n}")
+    
+    if st.window_start >= st.window_end:
         print("No shares in activation window!")
         return
     
-    version_weights = collections.defaultdict(float)
-    version_counts = collections.defaultdict(int)
-    miner_version_weights = collections.defaultdict(float)
-    miner_version_counts = collections.defaultdict(int)
-    share_type_counts = collections.defaultdict(int)
-    timestamps = []
-    
-    for h in window_heights:
-        share = shares[h]
-        weight = target_to_average_attempts(share['target'])
-        dv = share['desired_version']
-        sv = share['version']
-        addr = share['address']
-        
-        version_weights[dv] += weight
-        version_counts[dv] += 1
-        miner_version_weights[(addr, dv)] += weight
-        miner_version_counts[(addr, dv)] += 1
-        share_type_counts[sv] += 1
-        timestamps.append(share['timestamp'])
-    
+    version_weights = st.version_weights
     total_weight = sum(version_weights.values())
     
     print(f"\n--- Desired Version Distribution (by weight) ---")
     for dv in sorted(version_weights.keys()):
         pct = 100.0 * version_weights[dv] / total_weight if total_weight else 0
-        print(f"  v{dv}: {pct:.2f}% weight ({version_weights[dv]:.2e}), {version_counts[dv]} shares")
+        print(f"  v{dv}: {pct:.2f}% weight ({version_weights[dv]:.2e}), {st.version_counts[dv]} shares")
     
     print(f"\n--- Share Type (VERSION) Distribution ---")
-    for sv in sorted(share_type_counts.keys()):
-        print(f"  Share.VERSION={sv}: {share_type_counts[sv]} shares")
+    for sv in sorted(st.share_type_counts.keys()):
+        print(f"  Share.VERSION={sv}: {st.share_type_counts[sv]} shares")
     
     print(f"\n--- Miner Breakdown (by weight, all) ---")
-    sorted_miners = sorted(miner_version_weights.items(), key=lambda x: -x[1])
-    for (addr, dv), weight in sorted_miners:
+    sorted_miners = sorted(st.miner_version_weights.items(), key=lambda x: -x[1])
+    for (aid, dv), weight in sorted_miners:
         pct = 100.0 * weight / total_weight if total_weight else 0
-        cnt = miner_version_counts[(addr, dv)]
-        print(f"  {addr:<36s}  v{dv}  {pct:6.2f}% ({cnt} shares)")
+        cnt = st.miner_version_counts[(aid, dv)]
+        print(f"  {cols.addresses[aid]:<36s}  v{dv}  {pct:6.2f}% ({cnt} shares)")
     
-    if timestamps:
-        min_ts, max_ts = min(timestamps), max(timestamps)
-        print(f"\n--- Time Range ---")
-        print(f"  Oldest: {datetime.datetime.fromtimestamp(min_ts):%Y-%m-%d %H:%M:%S} ({(time.time()-min_ts)/3600:.1f}h ago)")
-        print(f"  Newest: {datetime.datetime.fromtimestamp(max_ts):%Y-%m-%d %H:%M:%S} ({(time.time()-max_ts)/3600:.1f}h ago)")
-        print(f"  Absheight range: {min(window_heights)} to {max(window_heights)}")
+    timestamps = cols.timestamp[st.window_start:st.window_end]
+    heights = cols.absheight[st.window_start:st.window_end]
+    min_ts, max_ts = min(timestamps), max(timestamps)
+    print(f"\n--- Time Range ---")
+    print(f"  Oldest: {datetime.datetime.fromtimestamp(min_ts):%Y-%m-%d %H:%M:%S} ({(time.time()-min_ts)/3600:.1f}h ago)")
+    print(f"  Newest: {datetime.datetime.fromtimestamp(max_ts):%Y-%m-%d %H:%M:%S} ({(time.time()-max_ts)/3600:.1f}h ago)")
+    print(f"  Absheight range: {min(heights)} to {max(heights)}")
 
 
-def analyze_full_chain(shares, chain):
-    """Analyze the entire chain for version distribution over time."""
+def report_full_chain(cols, st):
+    """Report the version distribution over the entire chain, by segment."""
     print("\n" + "=" * 80)
     print("FULL CHAIN VERSION DISTRIBUTION (by segment)")
     print("=" * 80)
     
-    segment_size = CHAIN_LENGTH // 10  # 864
-    
     print(f"\n{'Position':<14s} {'v35':>7s} {'v36':>7s} {'Other':>7s} {'Shares':>7s}  {'Oldest':<14s} {'Newest':<14s}")
     print("-" * 80)
     
-    for seg_start in range(0, len(chain), segment_size):
-        seg_end = min(seg_start + segment_size, len(chain))
-        seg_heights = chain[seg_start:seg_end]
-        
-        v35_w = v36_w = other_w = 0.0
-        ts_list = []
-        
-        for h in seg_heights:
-            s = shares[h]
-            w = target_to_average_attempts(s['target'])
-            dv = s['desired_version']
-            if dv == 35: v35_w += w
-            elif dv == 36: v36_w += w
-            else: other_w += w
-            ts_list.append(s['timestamp'])
+    for seg, (v35_w, v36_w, other_w) in enumerate(st.segment_weights):
+        seg_start = seg * SEGMENT_SIZE
+        seg_end = min(seg_start + SEGMENT_SIZE, st.n)
         
         total = v35_w + v36_w + other_w
         v35_pct = 100.0 * v35_w / total if total else 0
         v36_pct = 100.0 * v36_w / total if total else 0
         other_pct = 100.0 * other_w / total if total else 0
         
-        oldest = datetime.datetime.fromtimestamp(min(ts_list)).strftime('%m-%d %H:%M') if ts_list else '?'
-        newest = datetime.datetime.fromtimestamp(max(ts_list)).strftime('%m-%d %H:%M') if ts_list else '?'
+        ts_list = cols.timestamp[seg_start:seg_end]
+        oldest = datetime.datetime.fromtimestamp(min(ts_list)).strftime('%m-%d %H:%M')
+        newest = datetime.datetime.fromtimestamp(max(ts_list)).strftime('%m-%d %H:%M')
         
         label = f"{seg_start}-{seg_end-1}"
-        marker = " <-- ACTIVATION" if seg_start == CHAIN_LENGTH * 9 // 10 else ""
-        print(f"  {label:<12s} {v35_pct:6.1f}%  {v36_pct:6.1f}%  {other_pct:6.1f}%  {len(seg_heights):>5d}   {oldest}  ->  {newest}{marker}")
+        marker = " <-- ACTIVATION" if seg_start == WINDOW_START else ""
+        print(f"  {label:<12s} {v35_pct:6.1f}%  {v36_pct:6.1f}%  {other_pct:6.1f}%  {seg_end - seg_start:>5d}   {oldest}  ->  {newest}{marker}")
 
 
-def analyze_v35_shares(shares, chain):
+def report_v35_shares(cols, st):
     """Deep dive into v35-voting shares."""
     print("\n" + "=" * 80)
     print("V35 SHARE DEEP DIVE")
     print("=" * 80)
     
-    v35_shares = []
-    for i, h in enumerate(chain):
-        s = shares[h]
-        if s['desired_version'] == 35:
-            v35_shares.append((i, s))
-    
-    print(f"Total v35 shares in chain: {len(v35_shares)} / {len(chain)} ({100.0*len(v35_shares)/len(chain):.1f}%)")
+    v35_count = sum(len(rows) for rows in st.v35_by_addr.values())
+    print(f"Total v35 shares in chain: {v35_count} / {st.n} ({100.0*v35_count/st.n:.1f}%)")
     
-    if not v35_shares:
+    if not v35_count:
         print("No v35 shares found — chain is 100% v36!")
         return
     
-    # Group by address
-    by_addr = collections.defaultdict(list)
-    for pos, s in v35_shares:
-        by_addr[s['address']].append((pos, s))
-    
     print(f"\n--- V35 shares by miner address ---")
-    for addr, slist in sorted(by_addr.items(), key=lambda x: -len(x[1])):
-        positions = [p for p, s in slist]
-        timestamps = [s['timestamp'] for p, s in slist]
-        weights = [target_to_average_attempts(s['target']) for p, s in slist]
-        diffs = [target_to_difficulty(s['target']) for p, s in slist]
+    for aid, rows in sorted(st.v35_by_addr.items(), key=lambda x: -len(x[1])):
+        timestamps = [cols.timestamp[i] for i in rows]
+        weights = [cols.weight[i] for i in rows]
+        diffs = [target_to_difficulty(cols.target[i]) for i in rows]
         
-        print(f"\n  Address: {addr}")
-        print(f"    Count: {len(slist)} shares")
-        print(f"    Positions: {min(positions)} to {max(positions)} from tip")
+        print(f"\n  Address: {cols.addresses[aid]}")
+        print(f"    Count: {len(rows)} shares")
+        print(f"    Positions: {min(rows)} to {max(rows)} from tip")
         print(f"    Time: {datetime.datetime.fromtimestamp(min(timestamps)):%Y-%m-%d %H:%M:%S} to {datetime.datetime.fromtimestamp(max(timestamps)):%Y-%m-%d %H:%M:%S}")
         print(f"    Avg difficulty: {sum(diffs)/len(diffs):.4f}")
         print(f"    Total weight: {sum(weights):.2e}")
-        print(f"    Share.VERSION values: {set(s['version'] for p, s in slist)}")
+        print(f"    Share.VERSION values: {set(cols.version[i] for i in rows)}")
     
     # Position histogram
-    print(f"\n--- V35 position distribution (bucketed by {CHAIN_LENGTH//10}) ---")
+    print(f"\n--- V35 position distribution (bucketed by {SEGMENT_SIZE}) ---")
     buckets = collections.defaultdict(int)
-    for pos, s in v35_shares:
-        bucket = pos // (CHAIN_LENGTH // 10)
-        buckets[bucket] += 1
+    for rows in st.v35_by_addr.values():
+        for pos in rows:
+            buckets[pos // SEGMENT_SIZE] += 1
     
     for bucket in sorted(buckets.keys()):
-        start = bucket * (CHAIN_LENGTH // 10)
-        end = start + (CHAIN_LENGTH // 10) - 1
+        start = bucket * SEGMENT_SIZE
+        end = start + SEGMENT_SIZE - 1
         bar = '#' * min(buckets[bucket] // 3 + 1, 60)
-        marker = " <-- ACTIVATION" if start == CHAIN_LENGTH * 9 // 10 else ""
+        marker = " <-- ACTIVATION" if start == WINDOW_START else ""
         print(f"  {start:>5d}-{end:>5d}: {buckets[bucket]:>4d} shares  {bar}{marker}")
 
 
-def analyze_v36_shares(shares, chain):
+def report_v36_shares(cols, st):
     """Summary of v36-voting shares."""
     print("\n" + "=" * 80)
     print("V36 SHARE SUMMARY")
     print("=" * 80)
     
-    v36_shares = [(i, shares[h]) for i, h in enumerate(chain) if shares[h]['desired_version'] == 36]
-    
-    if not v36_shares:
+    if not st.v36_by_addr:
         print("No v36 shares found!")
         return
     
-    by_addr = collections.defaultdict(list)
-    for pos, s in v36_shares:
-        by_addr[s['address']].append((pos, s))
-    
-    print(f"Total v36 shares: {len(v36_shares)} / {len(chain)} ({100.0*len(v36_shares)/len(chain):.1f}%)")
+    v36_count = sum(len(rows) for rows in st.v36_by_addr.values())
+    print(f"Total v36 shares: {v36_count} / {st.n} ({100.0*v36_count/st.n:.1f}%)")
     print(f"\n--- V36 shares by miner ---")
-    for addr, slist in sorted(by_addr.items(), key=lambda x: -len(x[1])):
-        weights = sum(target_to_average_attempts(s['target']) for _, s in slist)
-        positions = [p for p, _ in slist]
-        print(f"  {addr:<36s}  {len(slist):>5d} shares  pos {min(positions)}-{max(positions)}  weight {weights:.2e}")
+    for aid, rows in sorted(st.v36_by_addr.items(), key=lambda x: -len(x[1])):
+        weights = sum(cols.weight[i] for i in rows)
+        print(f"  {cols.addresses[aid]:<36s}  {len(rows):>5d} shares  pos {min(rows)}-{max(rows)}  weight {weights:.2e}")
+
+
+def report_verdict(st):
+    """Final activation verdict for the window."""
+    print("\n" + "=" * 80)
+    print("ACTIVATION VERDICT")
+    print("=" * 80)
+    
+    if st.n < WINDOW_START + WINDOW_SIZE:
+        print(f"Chain too short ({st.n} < {WINDOW_START + WINDOW_SIZE})")
+        return
+    
+    v36_pct = 100.0 * st.window_v36_weight / st.window_weight if st.window_weight else 0
+    print(f"Activation window v36: {v36_pct:.2f}%  (need 95%)")
+    print(f"Status: {'YES - WOULD ACTIVATE' if v36_pct >= 95.0 else 'NO - NOT YET'}")
+    if v36_pct < 95.0:
+        # Nearest v35 share to tip in the window
+        v35_nearest_pos = st.window_first_v35
+        if v35_nearest_pos is not None:
+            remaining_positions = CHAIN_LENGTH - v35_nearest_pos
+            est_seconds = remaining_positions * 10
+            est_hours = est_seconds / 3600
+            print(f"  Nearest v35 share at position {v35_nearest_pos} from tip")
+            print(f"  Needs {remaining_positions} more shares to age out of window")
+            print(f"  Estimated time: ~{est_hours:.1f} hours ({est_seconds/60:.0f} min)")
 
 
 if __name__ == '__main__':
     share_dir = sys.argv[1] if len(sys.argv) > 1 else '/tmp/shares'
     
     print(f"Loading shares from {share_dir}...")
-    shares = load_all_shares(share_dir)
+    shares, addresses = load_all_shares(share_dir)
     
     if not shares:
         print("No shares found!")
@@ -600,42 +1006,11 @@ if __name__ == '__main__':
         print("Could not build chain!")
         sys.exit(1)
     
-    analyze_activation_window(shares, chain)
-    analyze_full_chain(shares, chain)
-    analyze_v35_shares(shares, chain)
-    analyze_v36_shares(shares, chain)
+    cols = ShareColumns(shares, chain, addresses)
+    st = analyze_all(cols)
     
-    # Final summary
-    print("\n" + "=" * 80)
-    print("ACTIVATION VERDICT")
-    print("=" * 80)
-    
-    window_start = CHAIN_LENGTH * 9 // 10
-    window_size = CHAIN_LENGTH // 10
-    if len(chain) >= window_start + window_size:
-        v36_weight = total_weight = 0.0
-        for h in chain[window_start:window_start + window_size]:
-            s = shares[h]
-            w = target_to_average_attempts(s['target'])
-            total_weight += w
-            if s['desired_version'] == 36:
-                v36_weight += w
-        v36_pct = 100.0 * v36_weight / total_weight if total_weight else 0
-        print(f"Activation window v36: {v36_pct:.2f}%  (need 95%)")
-        print(f"Status: {'YES - WOULD ACTIVATE' if v36_pct >= 95.0 else 'NO - NOT YET'}")
-        if v36_pct < 95.0:
-            # Find the nearest v35 share to tip in the window
-            v35_nearest_pos = None
-            for i, h in enumerate(chain[window_start:window_start + window_size]):
-                if shares[h]['desired_version'] == 35:
-                    if v35_nearest_pos is None:
-                        v35_nearest_pos = window_start + i
-            if v35_nearest_pos is not None:
-                remaining_positions = CHAIN_LENGTH - v35_nearest_pos
-                est_seconds = remaining_positions * 10
-                est_hours = est_seconds / 3600
-                print(f"  Nearest v35 share at position {v35_nearest_pos} from tip")
-                print(f"  Needs {remaining_positions} more shares to age out of window")
-                print(f"  Estimated time: ~{est_hours:.1f} hours ({est_seconds/60:.0f} min)")
-    else:
-        print(f"Chain too short ({len(chain)} < {window_start + window_size})")
+    report_activation_window(cols, st)
+    report_full_chain(cols, st)
+    report_v35_shares(cols, st)
+    report_v36_shares(cols, st)
+    report_verdict(st)
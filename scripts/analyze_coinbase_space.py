@@ -1,4 +1,4 @@
-#!/usr/bin/env python
+#!/usr/bin/env python3
 """
 Analyze coinbase space allocation with extranonce support
 
@@ -28,82 +28,88 @@ Multi-payout outputs are in worker_tx + payments_tx + donation_tx.
 These are completely separate from the OP_RETURN output that contains the nonce.
 """
 
-print "=" * 80
-print "COINBASE SPACE ALLOCATION ANALYSIS"
-print "=" * 80
-
-print "\n1. COINBASE TRANSACTION STRUCTURE:"
-print "   - Version (4 bytes)"
-print "   - Type (4 bytes)" 
-print "   - Input count (varint)"
-print "   - Coinbase input:"
-print "     * previous_output = None (36 bytes)"
-print "     * script length (varint)"
-print "     * script (variable) - contains height, merged mining, etc."
-print "     * sequence (4 bytes)"
-print "   - Output count (varint)"
-print "   - Multiple outputs:"
-print "     * Worker payouts (MULTI-PAYOUT) - value + script for each worker"
-print "     * Masternode/governance payments - value + script"
-print "     * Donation output - value + script"
-print "     * OP_RETURN output (CONTAINS THE NONCE):"
-print "       - value = 0 (8 bytes)"
-print "       - script length (varint)"
-print "       - script = OP_RETURN (0x6a) + 0x28 + ref_hash(32) + last_txout_nonce(8)"
-print "   - Lock time (4 bytes)"
-print "   - Extra payload (DIP3/DIP4 - variable, optional)"
-
-print "\n2. EXTRANONCE2 SPACE (8 bytes):"
-print "   - Located in: last_txout_nonce field of OP_RETURN output"
-print "   - Split by stratum:"
-print "     * extranonce1 = '' (0 bytes) - assigned by pool per connection"
-print "     * extranonce2 = 8 bytes - controlled by miner"
-
-print "\n3. MULTI-PAYOUT OUTPUTS:"
-print "   - Located in: worker_tx + payments_tx + donation_tx"
-print "   - Completely separate from the OP_RETURN output"
-print "   - Each output has:"
-print "     * value (8 bytes)"
-print "     * script length (varint)"  
-print "     * script (25 bytes for P2PKH)"
-
-print "\n4. SPACE ALLOCATION:"
-print "   coinb1 = [version][type][inputs][output_count][worker_outputs]"
-print "            [payment_outputs][donation_output][op_return_header]"
-print "            [ref_hash(32 bytes)]"
-print "   "
-print "   [EXTRANONCE2: 8 bytes] <-- This is last_txout_nonce, miner controls this"
-print "   "
-print "   coinb2 = [lock_time(4)][extra_payload(variable)]"
-
-print "\n5. CRITICAL INSIGHT:"
-print "   ✓ Multi-payout uses worker_tx + payments_tx + donation_tx"
-print "   ✓ Extranonce uses last_txout_nonce in OP_RETURN output"
-print "   ✓ These are SEPARATE tx_outs in the coinbase transaction"
-print "   ✓ NO CONFLICT - they don't share space!"
-
-print "\n6. POTENTIAL ISSUE - TX SIZE:"
-print "   - More worker payouts = larger coinb1"
-print "   - Larger coinb1 = more data for ASIC to hash"
-print "   - This could impact mining performance slightly"
-print "   - But does NOT break multi-payout functionality"
-
-print "\n7. EXTRANONCE1 CONCERN:"
-print "   - Current implementation: extranonce1 = '' (0 bytes)"
-print "   - This means ALL 8 bytes are extranonce2 (miner controlled)"
-print "   - If we wanted to support multiple workers per connection:"
-print "     * Could split: extranonce1=4 bytes (per worker), extranonce2=4 bytes (miner)"
-print "     * But current implementation is fine for ASICs"
-print "   - With 0-byte extranonce1:"
-print "     * Miner has full 8 bytes = 2^64 = 18 quintillion nonce values"
-print "     * More than enough for any ASIC!"
-
-print "\n8. CONCLUSION:"
-print "   ✅ Extranonce does NOT take space from multi-payout"
-print "   ✅ Multi-payout outputs are separate from nonce space"
-print "   ✅ Current implementation is CORRECT and SAFE"
-print "   ✅ No changes needed!"
-
-print "\n" + "=" * 80
-print "NO ISSUES FOUND - Extranonce and multi-payout are compatible!"
-print "=" * 80
+
+def main():
+    print("=" * 80)
+    print("COINBASE SPACE ALLOCATION ANALYSIS")
+    print("=" * 80)
+
+    print("\n1. COINBASE TRANSACTION STRUCTURE:")
+    print("   - Version (4 bytes)")
+    print("   - Type (4 bytes)")
+    print("   - Input count (varint)")
+    print("   - Coinbase input:")
+    print("     * previous_output = None (36 bytes)")
+    print("     * script length (varint)")
+    print("     * script (variable) - contains height, merged mining, etc.")
+    print("     * sequence (4 bytes)")
+    print("   - Output count (varint)")
+    print("   - Multiple outputs:")
+    print("     * Worker payouts (MULTI-PAYOUT) - value + script for each worker")
+    print("     * Masternode/governance payments - value + script")
+    print("     * Donation output - value + script")
+    print("     * OP_RETURN output (CONTAINS THE NONCE):")
+    print("       - value = 0 (8 bytes)")
+    print("       - script length (varint)")
+    print("       - script = OP_RETURN (0x6a) + 0x28 + ref_hash(32) + last_txout_nonce(8)")
+    print("   - Lock time (4 bytes)")
+    print("   - Extra payload (DIP3/DIP4 - variable, optional)")
+
+    print("\n2. EXTRANONCE2 SPACE (8 bytes):")
+    print("   - Located in: last_txout_nonce field of OP_RETURN output")
+    print("   - Split by stratum:")
+    print("     * extranonce1 = '' (0 bytes) - assigned by pool per connection")
+    print("     * extranonce2 = 8 bytes - controlled by miner")
+
+    print("\n3. MULTI-PAYOUT OUTPUTS:")
+    print("   - Located in: worker_tx + payments_tx + donation_tx")
+    print("   - Completely separate from the OP_RETURN output")
+    print("   - Each output has:")
+    print("     * value (8 bytes)")
+    print("     * script length (varint)")
+    print("     * script (25 bytes for P2PKH)")
+
+    print("\n4. SPACE ALLOCATION:")
+    print("   coinb1 = [version][type][inputs][output_count][worker_outputs]")
+    print("            [payment_outputs][donation_output][op_return_header]")
+    print("            [ref_hash(32 bytes)]")
+    print("   ")
+    print("   [EXTRANONCE2: 8 bytes] <-- This is last_txout_nonce, miner controls this")
+    print("   ")
+    print("   coinb2 = [lock_time(4)][extra_payload(variable)]")
+
+    print("\n5. CRITICAL INSIGHT:")
+    print("   ✓ Multi-payout uses worker_tx + payments_tx + donation_tx")
+    print("   ✓ Extranonce uses last_txout_nonce in OP_RETURN output")
+    print("   ✓ These are SEPARATE tx_outs in the coinbase transaction")
+    print("   ✓ NO CONFLICT - they don't share space!")
+
+    print("\n6. POTENTIAL ISSUE - TX SIZE:")
+    print("   - More worker payouts = larger coinb1")
+    print("   - Larger coinb1 = more data for ASIC to hash")
+    print("   - This could impact mining performance slightly")
+    print("   - But does NOT break multi-payout functionality")
+
+    print("\n7. EXTRANONCE1 CONCERN:")
+    print("   - Current implementation: extranonce1 = '' (0 bytes)")
+    print("   - This means ALL 8 bytes are extranonce2 (miner controlled)")
+    print("   - If we wanted to support multiple workers per connection:")
+    print("     * Could split: extranonce1=4 bytes (per worker), extranonce2=4 bytes (miner)")
+    print("     * But current implementation is fine for ASICs")
+    print("   - With 0-byte extranonce1:")
+    print("     * Miner has full 8 bytes = 2^64 = 18 quintillion nonce values")
+    print("     * More than enough for any ASIC!")
+
+    print("\n8. CONCLUSION:")
+    print("   ✅ Extranonce does NOT take space from multi-payout")
+    print("   ✅ Multi-payout outputs are separate from nonce space")
+    print("   ✅ Current implementation is CORRECT and SAFE")
+    print("   ✅ No changes needed!")
+
+    print("\n" + "=" * 80)
+    print("NO ISSUES FOUND - Extranonce and multi-payout are compatible!")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
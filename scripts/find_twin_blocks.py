@@ -20,24 +20,69 @@ This script:
 4. Finds matching pairs where both blocks are confirmed on their chains
 """
 
+import base64
+import functools
+import http.client
 import json
 import hashlib
+import itertools
+import os
+import sqlite3
 import subprocess
 import sys
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 
+# orjson is a much faster codec for the large getblock responses; fall back
+# to the stdlib when it isn't installed. json_dumps returns bytes either way.
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    orjson = None
+    json_loads = json.loads
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
 # Configuration
 LITECOIN_CLI = "litecoin-cli"
 LITECOIN_ARGS = ["-testnet"]
+# litecoind is reached over HTTP when rpcuser/rpcpassword are set in
+# LITECOIN_CONF or its auth cookie is readable; otherwise calls fall back to
+# LITECOIN_CLI. An rpcport in LITECOIN_CONF overrides LITECOIN_RPC_URL's port.
+LITECOIN_RPC_URL = "http://127.0.0.1:19332/"
+LITECOIN_CONF = os.path.expanduser("~/.litecoin/litecoin.conf")
+LITECOIN_COOKIE = os.path.expanduser("~/.litecoin/testnet4/.cookie")
 DOGECOIN_RPC_URL = "http://127.0.0.1:44555/"
 DOGECOIN_RPC_USER = "dogeuser"
 DOGECOIN_RPC_PASS = "YOUR_DOGE_RPC_PASSWORD"
 
+# Concurrent RPC workers for the tDOGE scan (each keeps its own connection)
+RPC_WORKERS = 16
+# Heights per JSON-RPC batch request in the tDOGE scan
+RPC_BATCH_SIZE = 250
+
+# Wallet transactions fetched per listtransactions page
+LTC_TX_PAGE_SIZE = 500
+
+# Persistent cache of block analyses; blocks with fewer confirmations than
+# CACHE_MIN_CONFIRMATIONS may still be reorged and are not cached
+CACHE_PATH = "twin_cache.sqlite"
+CACHE_MIN_CONFIRMATIONS = 6
+CACHE_COMMIT_EVERY = 500
+# Heights below the previous run's scan watermark are read back from the
+# cache; the last few are rescanned in case of a reorg
+SCAN_REORG_OVERLAP = 10
+
 # Merged mining marker in coinbase
 MM_MARKER = "fabe6d6d"
+MM_MARKER_BYTES = bytes.fromhex(MM_MARKER)
 
 
-def litecoin_rpc(method: str, params: List = None) -> dict:
+def litecoin_cli(method: str, params: List = None) -> dict:
     """Call Litecoin RPC via litecoin-cli"""
     cmd = [LITECOIN_CLI] + LITECOIN_ARGS + [method]
     if params:
@@ -47,13 +92,125 @@ def litecoin_rpc(method: str, params: List = None) -> dict:
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
         if result.returncode != 0:
             return {"error": result.stderr.strip()}
-        return json.loads(result.stdout) if result.stdout.strip() else {}
+        output = result.stdout.strip()
+        if not output:
+            return {}
+        try:
+            return json_loads(output)
+        except ValueError:
+            # String results (e.g. raw block hex) are printed unquoted
+            return output
     except Exception as e:
         return {"error": str(e)}
 
 
+def read_litecoin_conf(path: str) -> Dict[str, str]:
+    """Read the settings litecoind applies on testnet from litecoin.conf"""
+    general, testnet = {}, {}
+    section = None
+    try:
+        with open(path) as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line.startswith("[") and line.endswith("]"):
+                    section = line[1:-1].strip()
+                    continue
+                key, sep, value = line.partition("=")
+                if not sep:
+                    continue
+                key, value = key.strip(), value.strip()
+                if key.startswith("test."):
+                    testnet[key[5:]] = value
+                elif section == "test":
+                    testnet[key] = value
+                elif section is None and key != "rpcport":
+                    # litecoind only applies a top-level rpcport to mainnet
+                    general[key] = value
+    except OSError:
+        return {}
+    general.update(testnet)
+    return general
+
+
+@functools.lru_cache(maxsize=1)
+def litecoin_rpc_endpoint() -> Optional[Tuple[str, Tuple[str, str]]]:
+    """litecoind's RPC URL and credentials, or None if there are none"""
+    conf = read_litecoin_conf(LITECOIN_CONF)
+    url = LITECOIN_RPC_URL
+    if conf.get("rpcport"):
+        parts = urllib.parse.urlsplit(url)
+        url = parts._replace(netloc=f"{parts.hostname}:{conf['rpcport']}").geturl()
+    
+    # litecoind doesn't write a cookie when rpcpassword is configured
+    if conf.get("rpcuser") and conf.get("rpcpassword"):
+        return url, (conf["rpcuser"], conf["rpcpassword"])
+    try:
+        with open(LITECOIN_COOKIE) as f:
+            user, _, password = f.read().strip().partition(":")
+    except OSError:
+        return None
+    return url, (user, password)
+
+
+def litecoin_rpc(method: str, params: List = None) -> dict:
+    """Call Litecoin RPC over a persistent HTTP connection (or litecoin-cli)"""
+    endpoint = litecoin_rpc_endpoint()
+    if endpoint is None:
+        return litecoin_cli(method, params)
+    url, auth = endpoint
+    
+    payload = {
+        "jsonrpc": "1.0",
+        "id": "twin_finder",
+        "method": method,
+        "params": params or []
+    }
+    
+    try:
+        data = json_loads(_rpc_post(url, auth, json_dumps(payload)))
+    except Exception:
+        # Unreachable or refused (e.g. stale credentials): let litecoin-cli try
+        return litecoin_cli(method, params)
+    if data.get("error"):
+        return {"error": data["error"].get("message", str(data["error"]))}
+    # Match litecoin-cli, which prints nothing for a null result
+    result = data.get("result")
+    return {} if result is None else result
+
+
+# Per-thread keep-alive HTTP connections, keyed by host:port
+_rpc_local = threading.local()
+
+
+def _rpc_post(url: str, auth: Tuple[str, str], body: bytes) -> bytes:
+    """POST a JSON-RPC body over this thread's persistent connection to url"""
+    parts = urllib.parse.urlsplit(url)
+    conns = getattr(_rpc_local, "conns", None)
+    if conns is None:
+        conns = _rpc_local.conns = {}
+    headers = {
+        "Authorization": "Basic " + base64.b64encode(":".join(auth).encode()).decode(),
+        "Content-Type": "application/json",
+    }
+    
+    for attempt in range(2):
+        conn = conns.get(parts.netloc)
+        if conn is None:
+            conn = conns[parts.netloc] = http.client.HTTPConnection(
+                parts.hostname, parts.port, timeout=30)
+        try:
+            conn.request("POST", parts.path or "/", body, headers)
+            return conn.getresponse().read()
+        except (http.client.HTTPException, OSError):
+            # The node may have dropped the idle connection; reconnect once
+            conn.close()
+            del conns[parts.netloc]
+            if attempt:
+                raise
+
+
 def dogecoin_rpc(method: str, params: List = None) -> dict:
-    """Call Dogecoin RPC via curl"""
+    """Call Dogecoin RPC over a persistent HTTP connection"""
     payload = {
         "jsonrpc": "1.0",
         "id": "twin_finder",
@@ -62,59 +219,256 @@ def dogecoin_rpc(method: str, params: List = None) -> dict:
     }
     
     try:
-        cmd = [
-            "curl", "-s", "--user", f"{DOGECOIN_RPC_USER}:{DOGECOIN_RPC_PASS}",
-            "--data-binary", json.dumps(payload),
-            DOGECOIN_RPC_URL
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        data = json.loads(result.stdout)
+        body = _rpc_post(DOGECOIN_RPC_URL, (DOGECOIN_RPC_USER, DOGECOIN_RPC_PASS),
+                         json_dumps(payload))
+        data = json_loads(body)
         return data.get("result", {})
     except Exception as e:
         return {"error": str(e)}
 
 
+def dogecoin_rpc_batch(calls: List[Tuple[str, List]]) -> List:
+    """Send several Dogecoin RPC calls as one JSON-RPC batch request
+    
+    Returns the results in call order; on a transport error every entry is
+    an {"error": ...} dict, like dogecoin_rpc.
+    """
+    if not calls:
+        return []
+    payload = [
+        {"jsonrpc": "1.0", "id": i, "method": method, "params": params or []}
+        for i, (method, params) in enumerate(calls)
+    ]
+    
+    try:
+        body = _rpc_post(DOGECOIN_RPC_URL, (DOGECOIN_RPC_USER, DOGECOIN_RPC_PASS),
+                         json_dumps(payload))
+        data = json_loads(body)
+        if not isinstance(data, list):
+            raise ValueError(data.get("error") or "batch request rejected")
+        # Responses may come back in any order; place them by id
+        results = [None] * len(calls)
+        for response in data:
+            results[response["id"]] = response.get("result", {})
+        return results
+    except Exception as e:
+        return [{"error": str(e)}] * len(calls)
+
+
+class AnalysisCache:
+    """sqlite-backed store of block analyses keyed by block hash
+    
+    Confirmed blocks never change, so a repeat run only has to fetch blocks
+    it has not seen before. Confirmation counts do change; a hit is only
+    served once the chain's tip height is known (tip_heights), and its
+    confirmations are recomputed from it. Shared by the scan threads.
+    
+    The meta table holds small integers such as the tDOGE scan watermark.
+    """
+    
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(hash TEXT PRIMARY KEY, chain TEXT, height INT, data BLOB, confirmations INT)")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS cache_chain_height ON cache (chain, height)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v INT)")
+        self._pending = 0
+        self.tip_heights: Dict[str, int] = {}
+    
+    @staticmethod
+    def _decode(data: bytes, tip: int) -> Dict:
+        analysis = json_loads(data)
+        analysis["confirmations"] = tip - analysis["height"] + 1
+        return analysis
+    
+    def get(self, chain: str, blockhash: str) -> Optional[Dict]:
+        tip = self.tip_heights.get(chain)
+        if tip is None:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM cache WHERE hash = ? AND chain = ?",
+                (blockhash, chain)).fetchone()
+        if row is None:
+            return None
+        return self._decode(row[0], tip)
+    
+    def by_height(self, chain: str, start: int, stop: int) -> List[Dict]:
+        """Cached analyses for heights start <= h < stop, in height order"""
+        tip = self.tip_heights.get(chain)
+        if tip is None or start >= stop:
+            return []
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT data FROM cache WHERE chain = ? AND height >= ? AND height < ? "
+                "ORDER BY height", (chain, start, stop)).fetchall()
+        return [self._decode(row[0], tip) for row in rows]
+    
+    def get_meta(self, key: str) -> Optional[int]:
+        with self._lock:
+            row = self._db.execute("SELECT v FROM meta WHERE k = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+    
+    def set_meta(self, key: str, value: int):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+    
+    def put(self, chain: str, blockhash: str, analysis: Dict):
+        confirmations = analysis.get("confirmations", 0)
+        if confirmations < CACHE_MIN_CONFIRMATIONS or analysis.get("height") is None:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache (hash, chain, height, data, confirmations) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (blockhash, chain, analysis["height"], json_dumps(analysis), confirmations))
+            self._pending += 1
+            if self._pending >= CACHE_COMMIT_EVERY:
+                self._db.commit()
+                self._pending = 0
+    
+    def close(self):
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+
+# Opened by find_twin_blocks; analyses are not cached when this is None
+analysis_cache: Optional[AnalysisCache] = None
+
+
+def cached_analysis(chain: str):
+    """Serve a block analysis function from analysis_cache when possible"""
+    def decorator(analyze):
+        @functools.wraps(analyze)
+        def wrapper(blockhash: str, *args, **kwargs) -> Dict:
+            cache = analysis_cache
+            if cache is not None:
+                analysis = cache.get(chain, blockhash)
+                if analysis is not None:
+                    return analysis
+            analysis = analyze(blockhash, *args, **kwargs)
+            if cache is not None and "error" not in analysis:
+                cache.put(chain, blockhash, analysis)
+            return analysis
+        return wrapper
+    return decorator
+
+
 def reverse_hex(hex_str: str) -> str:
     """Reverse byte order of a hex string (little-endian to big-endian)"""
-    return "".join([hex_str[i:i+2] for i in range(len(hex_str)-2, -2, -2)])
+    return bytes.fromhex(hex_str)[::-1].hex()
 
 
-def extract_merged_hash_from_coinbase(coinbase_hex: str) -> Optional[str]:
-    """Extract the merged block hash from a coinbase transaction"""
-    idx = coinbase_hex.lower().find(MM_MARKER)
+@functools.lru_cache(maxsize=8192)
+def extract_merged_hash_from_coinbase(coinbase) -> Optional[str]:
+    """Extract the merged block hash from a coinbase transaction (hex or bytes)"""
+    if isinstance(coinbase, str):
+        try:
+            coinbase = bytes.fromhex(coinbase)
+        except ValueError:
+            return None
+    
+    idx = coinbase.find(MM_MARKER_BYTES)
     if idx == -1:
         return None
     
     # After marker is the 32-byte merged block hash (little-endian)
-    hash_start = idx + len(MM_MARKER)
-    hash_end = hash_start + 64
-    if len(coinbase_hex) < hash_end:
+    hash_start = idx + len(MM_MARKER_BYTES)
+    merged_hash_le = coinbase[hash_start:hash_start + 32]
+    if len(merged_hash_le) < 32:
         return None
     
-    merged_hash_le = coinbase_hex[hash_start:hash_end]
     # Convert to big-endian for block lookup
-    merged_hash_be = reverse_hex(merged_hash_le)
-    return merged_hash_be
+    return merged_hash_le[::-1].hex()
 
 
-def compute_pow_hash_from_header(header_hex: str) -> str:
-    """Compute the scrypt POW hash from a block header (80 bytes)"""
+_sha256 = hashlib.sha256
+
+
+@functools.lru_cache(maxsize=8192)
+def compute_pow_hash_from_bytes(header: bytes) -> str:
+    """Compute the block hash lookup key from a raw 80-byte block header"""
     # For scrypt coins, the POW hash is the scrypt hash of the header
-    # But for block hash lookups, we use SHA256d
-    header_bytes = bytes.fromhex(header_hex[:160])  # 80 bytes = 160 hex chars
-    sha_hash = hashlib.sha256(hashlib.sha256(header_bytes).digest()).digest()
-    return sha_hash[::-1].hex()
+    # But for block hash lookups, we use SHA256d. Two one-shot hashers over
+    # bytes is as cheap as hashlib gets; callers pass already-decoded
+    # headers so the hex is not reparsed per call
+    return _sha256(_sha256(header).digest()).digest()[::-1].hex()
+
+
+def compute_pow_hash_from_header(header_hex: str) -> str:
+    """Compute the block hash lookup key from a hex block header (80 bytes)"""
+    # 80 bytes = 160 hex chars
+    return compute_pow_hash_from_bytes(bytes.fromhex(header_hex[:160]))
+
+
+def read_compact_size(data: bytes, pos: int) -> Tuple[int, int]:
+    """Read a CompactSize integer at pos; returns (value, new_pos)"""
+    n = data[pos]
+    if n < 0xfd:
+        return n, pos + 1
+    size = {0xfd: 2, 0xfe: 4, 0xff: 8}[n]
+    return int.from_bytes(data[pos + 1:pos + 1 + size], "little"), pos + 1 + size
+
+
+def first_tx_from_block(block: bytes) -> bytes:
+    """Slice the first (coinbase) transaction out of a serialized block"""
+    _, pos = read_compact_size(block, 80)  # skip header, tx count
+    start = pos
+    pos += 4  # version
+    segwit = block[pos] == 0  # marker byte, then a non-zero flag byte
+    if segwit:
+        pos += 2
+    
+    n_in, pos = read_compact_size(block, pos)
+    for _ in range(n_in):
+        pos += 36  # previous output
+        script_len, pos = read_compact_size(block, pos)
+        pos += script_len + 4  # script, sequence
+    
+    n_out, pos = read_compact_size(block, pos)
+    for _ in range(n_out):
+        pos += 8  # value
+        script_len, pos = read_compact_size(block, pos)
+        pos += script_len
+    
+    if segwit:
+        for _ in range(n_in):
+            n_items, pos = read_compact_size(block, pos)
+            for _ in range(n_items):
+                item_len, pos = read_compact_size(block, pos)
+                pos += item_len
+    
+    pos += 4  # lock time
+    if pos > len(block):
+        raise ValueError("truncated block")
+    return block[start:pos]
 
 
 def get_ltc_mined_blocks() -> List[Dict]:
     """Get all mined tLTC blocks from the wallet"""
     print("Fetching mined tLTC blocks from wallet...")
     
-    # Get all transactions, filter for generated/immature
-    txs = litecoin_rpc("listtransactions", ["*", 1000, 0])
-    if isinstance(txs, dict) and "error" in txs:
-        print(f"Error fetching transactions: {txs['error']}")
-        return []
+    # Get all transactions, filter for generated/immature. Pages come back
+    # newest first and each page is oldest-first, so reassemble them in
+    # reverse to keep the wallet's chronological order.
+    pages = []
+    while True:
+        page = litecoin_rpc("listtransactions", ["*", LTC_TX_PAGE_SIZE, len(pages) * LTC_TX_PAGE_SIZE])
+        if isinstance(page, dict) and "error" in page:
+            print(f"Error fetching transactions: {page['error']}")
+            if not pages:
+                return []
+            break
+        pages.append(page)
+        if len(page) < LTC_TX_PAGE_SIZE:
+            break
+    txs = itertools.chain.from_iterable(reversed(pages))
     
     mined_blocks = []
     seen_hashes = set()
@@ -181,39 +535,49 @@ def get_doge_recent_blocks(start_height: int, count: int = 500) -> List[str]:
     return blocks
 
 
+@cached_analysis("ltc")
 def analyze_ltc_block(blockhash: str) -> Dict:
     """Analyze a tLTC block for merged mining data"""
-    block = litecoin_rpc("getblock", [blockhash, 2])
-    if isinstance(block, dict) and "error" in block:
-        return {"error": block["error"]}
+    header = litecoin_rpc("getblockheader", [blockhash])
+    if isinstance(header, dict) and "error" in header:
+        return {"error": header["error"]}
+    
+    # Only the coinbase is needed, so fetch the raw block and slice it out
+    # here rather than have the node decode every transaction (verbosity 2)
+    raw_block = litecoin_rpc("getblock", [blockhash, 0])
+    if isinstance(raw_block, dict):
+        return {"error": raw_block.get("error", "Block not found")}
     
     result = {
         "blockhash": blockhash,
-        "height": block.get("height"),
-        "confirmations": block.get("confirmations", 0),
-        "time": block.get("time"),
+        "height": header.get("height"),
+        "confirmations": header.get("confirmations", 0),
+        "time": header.get("time"),
         "pow_hash": blockhash,  # For scrypt, block hash IS the POW hash
     }
     
     # Get coinbase transaction
-    if block.get("tx") and len(block["tx"]) > 0:
-        coinbase = block["tx"][0]
-        coinbase_hex = coinbase.get("hex", "")
-        
-        # Extract merged mining hash
-        merged_hash = extract_merged_hash_from_coinbase(coinbase_hex)
-        if merged_hash:
-            result["merged_hash"] = merged_hash
-            result["has_merged_mining"] = True
-        else:
-            result["has_merged_mining"] = False
+    try:
+        coinbase = first_tx_from_block(bytes.fromhex(raw_block))
+    except (ValueError, IndexError, KeyError):
+        return result
+    
+    # Extract merged mining hash
+    merged_hash = extract_merged_hash_from_coinbase(coinbase)
+    if merged_hash:
+        result["merged_hash"] = merged_hash
+        result["has_merged_mining"] = True
+    else:
+        result["has_merged_mining"] = False
     
     return result
 
 
-def analyze_doge_block(blockhash: str) -> Dict:
-    """Analyze a tDOGE block for auxpow data"""
-    block = dogecoin_rpc("getblock", [blockhash, True])
+@cached_analysis("doge")
+def analyze_doge_block(blockhash: str, block: Optional[dict] = None) -> Dict:
+    """Analyze a tDOGE block for auxpow data (fetched unless given)"""
+    if block is None:
+        block = dogecoin_rpc("getblock", [blockhash, True])
     if not block or isinstance(block, dict) and "error" in block:
         return {"error": "Block not found"}
     
@@ -237,8 +601,9 @@ def analyze_doge_block(blockhash: str) -> Dict:
         if auxpow.get("parentblock"):
             parent_header = auxpow["parentblock"]
             result["parent_header"] = parent_header
-            # Compute hash from header
-            pow_hash = compute_pow_hash_from_header(parent_header)
+            # Compute hash from header, decoded once to raw bytes
+            header = bytes.fromhex(parent_header[:160])
+            pow_hash = compute_pow_hash_from_bytes(header)
             result["pow_hash"] = pow_hash
     else:
         result["has_auxpow"] = False
@@ -246,8 +611,34 @@ def analyze_doge_block(blockhash: str) -> Dict:
     return result
 
 
+def fetch_and_analyze_doge_blocks(heights: range) -> List[Dict]:
+    """Look up and analyze a run of tDOGE blocks with two batch requests"""
+    hashes = dogecoin_rpc_batch([("getblockhash", [height]) for height in heights])
+    hashes = [h for h in hashes if h and not isinstance(h, dict)]
+    # Only fetch the blocks the cache can't answer for
+    cached = {}
+    if analysis_cache is not None:
+        for h in hashes:
+            analysis = analysis_cache.get("doge", h)
+            if analysis is not None:
+                cached[h] = analysis
+    missing = [h for h in hashes if h not in cached]
+    blocks = dict(zip(missing, dogecoin_rpc_batch([("getblock", [h, True]) for h in missing])))
+    return [cached[h] if h in cached else analyze_doge_block(h, blocks[h]) for h in hashes]
+
+
 def find_twin_blocks():
     """Main function to find twin blocks"""
+    global analysis_cache
+    analysis_cache = AnalysisCache(CACHE_PATH)
+    try:
+        _find_twin_blocks()
+    finally:
+        analysis_cache.close()
+        analysis_cache = None
+
+
+def _find_twin_blocks():
     print("=" * 70)
     print("TWIN BLOCK FINDER - Merged Mining Verification")
     print("=" * 70)
@@ -260,13 +651,14 @@ def find_twin_blocks():
         return
     
     # Step 2: Analyze each tLTC block
+    ltc_tip = litecoin_rpc("getblockcount")
+    if isinstance(ltc_tip, int):
+        analysis_cache.tip_heights["ltc"] = ltc_tip
     print()
     print("Analyzing tLTC blocks for merged mining data...")
-    ltc_analyzed = []
-    for block in ltc_blocks:
-        analysis = analyze_ltc_block(block["blockhash"])
-        if "error" not in analysis:
-            ltc_analyzed.append(analysis)
+    with ThreadPoolExecutor(max_workers=RPC_WORKERS) as executor:
+        analyses = executor.map(analyze_ltc_block, [b["blockhash"] for b in ltc_blocks])
+        ltc_analyzed = [a for a in analyses if "error" not in a]
     
     print(f"Analyzed {len(ltc_analyzed)} tLTC blocks")
     mm_blocks = [b for b in ltc_analyzed if b.get("has_merged_mining")]
@@ -279,6 +671,7 @@ def find_twin_blocks():
         return
     
     doge_height = doge_info.get("blocks", 0)
+    analysis_cache.tip_heights["doge"] = doge_height
     print(f"\nCurrent tDOGE height: {doge_height}")
     
     # Step 4: Build a map of tLTC POW hashes
@@ -297,46 +690,76 @@ def find_twin_blocks():
     print(f"\nScanning tDOGE blocks from height {start_height} to {doge_height}...")
     
     twins_found = []
-    checked = 0
     
-    for height in range(start_height, doge_height + 1):
-        blockhash = dogecoin_rpc("getblockhash", [height])
-        if not blockhash or isinstance(blockhash, dict):
-            continue
-        
-        doge_analysis = analyze_doge_block(blockhash)
-        if "error" in doge_analysis:
-            continue
-        
-        checked += 1
-        if checked % 500 == 0:
-            print(f"  Checked {checked} tDOGE blocks...")
-        
-        # Check if this tDOGE block's POW hash matches any tLTC block
+    # Every confirmed block below the last run's watermark was cached by
+    # that run, so only heights from there on need asking the node about
+    last_scanned = analysis_cache.get_meta("doge_last_scanned")
+    scan_height = start_height
+    if last_scanned is not None:
+        scan_height = min(max(start_height, last_scanned - SCAN_REORG_OVERLAP), doge_height + 1)
+    doge_analyzed = analysis_cache.by_height("doge", start_height, scan_height)
+    if doge_analyzed:
+        print(f"  Loaded {len(doge_analyzed)} tDOGE blocks below height {scan_height} from cache")
+    
+    # The scan is I/O bound: heights are fetched in batch requests of
+    # RPC_BATCH_SIZE, spread over a pool of threads that each keep their own
+    # connection. map() yields in height order, so blocks are collected in
+    # the same order as a serial scan.
+    batches = [range(h, min(h + RPC_BATCH_SIZE, doge_height + 1))
+               for h in range(scan_height, doge_height + 1, RPC_BATCH_SIZE)]
+    # Blocks this deep have enough confirmations to be cached, so the next
+    # run can start from here - unless a batch failed below it, whose
+    # heights were not cached and must be asked for again
+    watermark = doge_height - CACHE_MIN_CONFIRMATIONS
+    with ThreadPoolExecutor(max_workers=RPC_WORKERS) as executor:
+        for heights, analyses in zip(batches, executor.map(fetch_and_analyze_doge_blocks, batches)):
+            # Heights whose hash lookup failed are missing from analyses
+            if len(analyses) < len(heights) or any("error" in a for a in analyses):
+                watermark = min(watermark, heights.start)
+            
+            for doge_analysis in analyses:
+                if "error" in doge_analysis:
+                    continue
+                
+                doge_analyzed.append(doge_analysis)
+                if len(doge_analyzed) % 500 == 0:
+                    print(f"  Checked {len(doge_analyzed)} tDOGE blocks...")
+    
+    if watermark < doge_height - CACHE_MIN_CONFIRMATIONS:
+        print(f"  Some tDOGE blocks from height {watermark} could not be fetched; they will be rescanned next run")
+    analysis_cache.set_meta("doge_last_scanned", watermark)
+    
+    # Match the tDOGE POW hashes and parent blockhashes against the tLTC
+    # POW hashes with one set intersection; only the blocks that hit are
+    # looked at individually
+    matches = ({d.get("pow_hash") for d in doge_analyzed}
+               | {d.get("parent_blockhash") for d in doge_analyzed}) & ltc_pow_map.keys()
+    
+    for doge_analysis in (doge_analyzed if matches else ()):
         pow_hash = doge_analysis.get("pow_hash")
         parent_hash = doge_analysis.get("parent_blockhash")
         
         # Try both the computed POW hash and the parent blockhash
-        ltc_match = None
-        if pow_hash and pow_hash in ltc_pow_map:
+        if pow_hash in matches:
             ltc_match = ltc_pow_map[pow_hash]
-        elif parent_hash and parent_hash in ltc_pow_map:
+        elif parent_hash in matches:
             ltc_match = ltc_pow_map[parent_hash]
+        else:
+            continue
         
-        if ltc_match:
-            twin = {
-                "ltc_hash": ltc_match["blockhash"],
-                "ltc_height": ltc_match["height"],
-                "ltc_confirmations": ltc_match["confirmations"],
-                "doge_hash": doge_analysis["blockhash"],
-                "doge_height": doge_analysis["height"],
-                "doge_confirmations": doge_analysis["confirmations"],
-                "pow_hash": pow_hash or parent_hash,
-            }
-            twins_found.append(twin)
-            print(f"\n  *** TWIN FOUND! ***")
-            print(f"      tLTC: {twin['ltc_hash'][:16]}... (height {twin['ltc_height']}, {twin['ltc_confirmations']} conf)")
-            print(f"      tDOGE: {twin['doge_hash'][:16]}... (height {twin['doge_height']}, {twin['doge_confirmations']} conf)")
+        twin = {
+            "ltc_hash": ltc_match["blockhash"],
+            "ltc_height": ltc_match["height"],
+            "ltc_confirmations": ltc_match["confirmations"],
+            "doge_hash": doge_analysis["blockhash"],
+            "doge_height": doge_analysis["height"],
+            "doge_confirmations": doge_analysis["confirmations"],
+            "pow_hash": pow_hash or parent_hash,
+        }
+        twins_found.append(twin)
+        print(f"\n  *** TWIN FOUND! ***")
+        print(f"      tLTC: {twin['ltc_hash'][:16]}... (height {twin['ltc_height']}, {twin['ltc_confirmations']} conf)")
+        print(f"      tDOGE: {twin['doge_hash'][:16]}... (height {twin['doge_height']}, {twin['doge_confirmations']} conf)")
     
     # Step 6: Also check merged_hash from tLTC coinbase
     print(f"\nAlso checking merged_hash references in tLTC coinbases...")
@@ -6,12 +6,27 @@ This server feeds genesis block work to scrypt ASICs like AntRouter L1.
 Once a valid nonce is found, it prints the genesis parameters.
 """
 
-import socket
+import asyncio
+import concurrent.futures
 import json
+import os
 import struct
 import sys
 import time
-import threading
+
+# orjson encodes straight to bytes (newline included, so each stratum line
+# is built in one allocation) and parses bytes without a decode step; fall
+# back to the stdlib when it isn't installed
+try:
+    import orjson
+    json_loads = orjson.loads
+    def json_line(obj):
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    orjson = None
+    json_loads = json.loads
+    def json_line(obj):
+        return json.dumps(obj).encode() + b'\n'
 
 try:
     import ltc_scrypt
@@ -30,6 +45,8 @@ GENESIS_BITS = 0x1e0ffff0
 # Stratum parameters
 EXTRANONCE1 = "00000000"
 EXTRANONCE2_SIZE = 4
+# Longest request line accepted from a miner; stratum messages are well under 1 KiB
+MAX_LINE_LENGTH = 16 * 1024
 
 def bytes_to_hex_le(data):
     """Convert bytes to little-endian hex string"""
@@ -71,6 +88,24 @@ class StratumServer:
         self.found_genesis = None
         self.target = compact_to_target(GENESIS_BITS)
         self.running = True
+        self.genesis_found = None  # asyncio.Event, created by serve()
+        # Scrypt verification runs in worker processes, off the event loop
+        self._hash_pool = (concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count())
+                           if ltc_scrypt else None)
+        
+        # Genesis work never changes, so every miner gets the same job: encode
+        # the post-subscribe messages once instead of per connection.
+        # Low difficulty for shares
+        self._difficulty_bytes = json_line(self.create_set_difficulty(0.001))
+        self._notify_bytes = json_line(self.create_mining_notify(get_job_id()))
+        
+        # The first 76 header bytes are fixed; submissions only vary the nonce
+        self._header_prefix = (
+            struct.pack('<I', GENESIS_VERSION)
+            + hex_to_bytes_le(GENESIS_PREV_BLOCK)
+            + hex_to_bytes_le(GENESIS_MERKLE_ROOT)
+            + struct.pack('<II', GENESIS_TIMESTAMP, GENESIS_BITS)
+        )
         
     def create_mining_notify(self, job_id, clean_jobs=True):
         """Create mining.notify message for genesis block"""
@@ -134,7 +169,7 @@ class StratumServer:
         print(f"Client {client_id} authorized as: {username}")
         return {"id": msg_id, "result": True, "error": None}
     
-    def handle_submit(self, client_id, msg_id, params):
+    async def handle_submit(self, client_id, msg_id, params):
         """Handle mining.submit - check if valid genesis found"""
         # params: [worker, job_id, extranonce2, ntime, nonce]
         worker = params[0]
@@ -149,19 +184,19 @@ class StratumServer:
         print(f"  Time: {ntime}")
         
         # Reconstruct block header and verify
-        nonce_int = int(nonce, 16)
-        nonce_int = struct.unpack('<I', struct.pack('>I', nonce_int))[0]  # Swap endianness
+        # The submitted hex is the header's nonce bytes in order; the
+        # chainparams nonce is those bytes read as a little-endian uint32
+        nonce_bytes = int(nonce, 16).to_bytes(4, 'big')
+        nonce_int = int.from_bytes(nonce_bytes, 'little')
         
         # Build header
-        header = struct.pack('<I', GENESIS_VERSION)
-        header += bytes.fromhex(GENESIS_PREV_BLOCK)[::-1]
-        header += bytes.fromhex(GENESIS_MERKLE_ROOT)[::-1]
-        header += struct.pack('<I', GENESIS_TIMESTAMP)
-        header += struct.pack('<I', GENESIS_BITS)
-        header += struct.pack('<I', nonce_int)
+        header = self._header_prefix + nonce_bytes
         
         if ltc_scrypt:
-            hash_result = ltc_scrypt.getPoWHash(header)
+            # Scrypt is deliberately slow; hash in the process pool so other
+            # miners' messages keep flowing meanwhile
+            loop = asyncio.get_running_loop()
+            hash_result = await loop.run_in_executor(self._hash_pool, ltc_scrypt.getPoWHash, header)
             hash_int = int.from_bytes(hash_result, 'little')
             hash_hex = hash_result[::-1].hex()
             
@@ -176,80 +211,78 @@ class StratumServer:
                 print(f'  genesis = CreateGenesisBlock({GENESIS_TIMESTAMP}, {nonce_int}, 0x{GENESIS_BITS:08x}, 1, 88 * COIN);')
                 print(f'  assert(consensus.hashGenesisBlock == uint256S("0x{hash_hex}"));')
                 self.found_genesis = (nonce_int, hash_hex)
+                self.genesis_found.set()
                 return {"id": msg_id, "result": True, "error": None}
             else:
                 print("  Share valid but doesn't meet genesis target")
         
         return {"id": msg_id, "result": True, "error": None}
     
-    def handle_client(self, conn, addr):
+    async def handle_client(self, reader, writer):
         """Handle a single client connection"""
+        addr = writer.get_extra_info('peername')
         client_id = f"{addr[0]}:{addr[1]}"
         print(f"Client connected: {client_id}")
-        self.clients[client_id] = conn
-        
-        buffer = ""
-        job_id = get_job_id()
+        self.clients[client_id] = writer
         
         try:
             while self.running and not self.found_genesis:
-                data = conn.recv(4096).decode('utf-8')
-                if not data:
+                # The reader frames lines on its own bytes buffer, so
+                # pipelined requests are split without decoding or copying
+                # the rest of what was received
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError:
                     break
+                except asyncio.LimitOverrunError:
+                    print(f"Line longer than {MAX_LINE_LENGTH} bytes from {client_id}")
+                    break
+                if not line.strip():
+                    continue
                 
-                buffer += data
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
-                    if not line.strip():
-                        continue
+                try:
+                    msg = json_loads(line)
+                    method = msg.get('method', '')
+                    msg_id = msg.get('id')
+                    params = msg.get('params', [])
                     
-                    try:
-                        msg = json.loads(line)
-                        method = msg.get('method', '')
-                        msg_id = msg.get('id')
-                        params = msg.get('params', [])
+                    print(f"Received: {method}")
+                    
+                    if method == 'mining.subscribe':
+                        response = self.handle_subscribe(client_id, msg_id)
+                        # Send the reply, difficulty and job in one write
+                        writer.writelines((json_line(response),
+                                           self._difficulty_bytes, self._notify_bytes))
                         
-                        print(f"Received: {method}")
+                    elif method == 'mining.authorize':
+                        response = self.handle_authorize(client_id, msg_id, params)
+                        writer.write(json_line(response))
                         
-                        if method == 'mining.subscribe':
-                            response = self.handle_subscribe(client_id, msg_id)
-                            conn.send((json.dumps(response) + '\n').encode())
-                            
-                            # Send difficulty and job
-                            diff_msg = self.create_set_difficulty(0.001)  # Low difficulty for shares
-                            conn.send((json.dumps(diff_msg) + '\n').encode())
-                            
-                            notify_msg = self.create_mining_notify(job_id)
-                            conn.send((json.dumps(notify_msg) + '\n').encode())
-                            
-                        elif method == 'mining.authorize':
-                            response = self.handle_authorize(client_id, msg_id, params)
-                            conn.send((json.dumps(response) + '\n').encode())
-                            
-                        elif method == 'mining.submit':
-                            response = self.handle_submit(client_id, msg_id, params)
-                            conn.send((json.dumps(response) + '\n').encode())
-                            
-                        elif method == 'mining.extranonce.subscribe':
-                            conn.send((json.dumps({"id": msg_id, "result": True, "error": None}) + '\n').encode())
-                            
-                    except json.JSONDecodeError as e:
-                        print(f"JSON error: {e}")
+                    elif method == 'mining.submit':
+                        response = await self.handle_submit(client_id, msg_id, params)
+                        writer.write(json_line(response))
                         
+                    elif method == 'mining.extranonce.subscribe':
+                        writer.write(json_line({"id": msg_id, "result": True, "error": None}))
+                    
+                    await writer.drain()
+                    
+                except json.JSONDecodeError as e:
+                    print(f"JSON error: {e}")
+                    
         except Exception as e:
             print(f"Client error: {e}")
         finally:
             print(f"Client disconnected: {client_id}")
-            conn.close()
+            writer.close()
             del self.clients[client_id]
     
-    def run(self):
-        """Start the stratum server"""
-        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        server.bind((self.host, self.port))
-        server.listen(5)
-        server.settimeout(1.0)
+    async def serve(self):
+        """Accept miners until a genesis block is found"""
+        self.genesis_found = asyncio.Event()
+        server = await asyncio.start_server(
+            self.handle_client, self.host, self.port, limit=MAX_LINE_LENGTH,
+            reuse_address=True)
         
         print(f"\n{'='*60}")
         print(f"Genesis Block Stratum Server")
@@ -265,18 +298,22 @@ class StratumServer:
         print(f"{'='*60}\n")
         
         try:
-            while self.running and not self.found_genesis:
-                try:
-                    conn, addr = server.accept()
-                    thread = threading.Thread(target=self.handle_client, args=(conn, addr))
-                    thread.daemon = True
-                    thread.start()
-                except socket.timeout:
-                    continue
+            await self.genesis_found.wait()
+        finally:
+            server.close()
+            for writer in list(self.clients.values()):
+                writer.close()
+    
+    def run(self):
+        """Start the stratum server"""
+        # All connections are served from one thread by the asyncio loop
+        try:
+            asyncio.run(self.serve())
         except KeyboardInterrupt:
             print("\nShutting down...")
         finally:
-            server.close()
+            if self._hash_pool:
+                self._hash_pool.shutdown(cancel_futures=True)
             
         if self.found_genesis:
             print(f"\n\nGENESIS MINING COMPLETE!")
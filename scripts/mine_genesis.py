@@ -7,6 +7,7 @@ Uses scrypt algorithm like Dogecoin/Litecoin.
 """
 
 import hashlib
+import multiprocessing
 import struct
 import time
 import sys
@@ -32,14 +33,28 @@ except ImportError:
     except ImportError:
         print("Warning: scrypt not available, using hashlib (won't match Dogecoin)")
 
+# Builds of ltc_scrypt with scanHash search a whole nonce run in C
+SCAN_HASH = getattr(ltc_scrypt, 'scanHash', None) if USE_LTC_SCRYPT else None
+
+# Nonces handed to a worker process at a time
+NONCE_CHUNK = 16384
+NONCE_LIMIT = 0x100000000
+
+# Precompiled packer for the header's 32-bit little-endian fields
+_U32 = struct.Struct('<I')
+
+_sha256 = hashlib.sha256
+
 def double_sha256(data):
-    return hashlib.sha256(hashlib.sha256(data).digest()).digest()
+    return _sha256(_sha256(data).digest()).digest()
 
 def scrypt_hash(header):
     """Scrypt hash as used by Dogecoin/Litecoin"""
     if USE_LTC_SCRYPT:
         return ltc_scrypt.getPoWHash(header)
     elif HAS_SCRYPT:
+        # py-scrypt only takes bytes, not the bytearray the miner reuses
+        header = bytes(header)
         return scrypt.hash(header, header, N=1024, r=1, p=1, buflen=32)
     else:
         return double_sha256(header)
@@ -64,16 +79,37 @@ def compact_to_target(bits):
 
 def create_block_header(version, prev_block, merkle_root, timestamp, bits, nonce):
     """Create block header bytes"""
-    header = struct.pack('<I', version)  # 4 bytes version
+    header = _U32.pack(version)  # 4 bytes version
     header += prev_block[::-1]  # 32 bytes prev_block (reversed)
     header += merkle_root[::-1]  # 32 bytes merkle_root (reversed)
-    header += struct.pack('<I', timestamp)  # 4 bytes timestamp
-    header += struct.pack('<I', bits)  # 4 bytes bits
-    header += struct.pack('<I', nonce)  # 4 bytes nonce
+    header += _U32.pack(timestamp)  # 4 bytes timestamp
+    header += _U32.pack(bits)  # 4 bytes bits
+    header += _U32.pack(nonce)  # 4 bytes nonce
     return header
 
-def mine_genesis(timestamp, bits, merkle_root_hex, prev_block_hex="0"*64, start_nonce=0, version=1):
-    """Mine a genesis block"""
+def _mine_range(args):
+    """Search nonces start <= nonce < stop, returning (nonce, hash) for the first hit"""
+    prefix, target, start, stop = args
+    if SCAN_HASH is not None:
+        return SCAN_HASH(prefix + bytes(4), start, stop, bytes_from_uint256(target))
+    
+    # One header buffer per run; only its last four bytes change
+    header = bytearray(80)
+    header[:76] = prefix
+    # A hash at or below target has at least as many zero top bytes, so
+    # nearly every miss is rejected without building an int from it
+    zero_tail = bytes(32 - (target.bit_length() + 7) // 8)
+    pack_nonce = _U32.pack_into
+    for nonce in range(start, stop):
+        pack_nonce(header, 76, nonce)
+        hash_result = scrypt_hash(header)
+        if hash_result.endswith(zero_tail) and uint256_from_bytes(hash_result) <= target:
+            return nonce, hash_result
+    return None
+
+def mine_genesis(timestamp, bits, merkle_root_hex, prev_block_hex="0"*64, start_nonce=0, version=1,
+                 workers=None):
+    """Mine a genesis block, searching nonces on `workers` processes (default: all cores)"""
     target = compact_to_target(bits)
     print(f"Mining genesis block...")
     print(f"  Timestamp: {timestamp} ({time.ctime(timestamp)})")
@@ -85,39 +121,42 @@ def mine_genesis(timestamp, bits, merkle_root_hex, prev_block_hex="0"*64, start_
     prev_block = bytes.fromhex(prev_block_hex)
     merkle_root = bytes.fromhex(merkle_root_hex)
     
-    nonce = start_nonce
+    # Only the nonce changes between attempts, so the rest of the header is
+    # built once and workers just append the nonce to it
+    prefix = create_block_header(version, prev_block, merkle_root, timestamp, bits, 0)[:76]
+    chunks = ((prefix, target, n, min(n + NONCE_CHUNK, NONCE_LIMIT))
+              for n in range(start_nonce, NONCE_LIMIT, NONCE_CHUNK))
+    
     start_time = time.time()
     last_print = start_time
     
-    while True:
-        header = create_block_header(version, prev_block, merkle_root, timestamp, bits, nonce)
-        hash_result = scrypt_hash(header)
-        hash_int = uint256_from_bytes(hash_result)
-        
-        if hash_int <= target:
-            elapsed = time.time() - start_time
-            hash_hex = hash_result[::-1].hex()
-            print(f"\n*** GENESIS FOUND! ***")
-            print(f"  Nonce: {nonce}")
-            print(f"  Hash: {hash_hex}")
-            print(f"  Time: {elapsed:.2f} seconds")
-            print(f"\nUse these values in chainparams.cpp:")
-            print(f"  genesis = CreateGenesisBlock({timestamp}, {nonce}, 0x{bits:08x}, {version}, 88 * COIN);")
-            print(f"  assert(consensus.hashGenesisBlock == uint256S(\"0x{hash_hex}\"));")
-            return nonce, hash_hex
-        
-        nonce += 1
-        
-        if nonce % 100000 == 0:
+    # Each task searches its own run of NONCE_CHUNK nonces, so workers never
+    # overlap. imap returns results in nonce order: the nonce found is the
+    # one a serial search would find, and leaving the pool stops the rest.
+    with multiprocessing.Pool(workers) as pool:
+        for i, found in enumerate(pool.imap(_mine_range, chunks)):
+            if found:
+                nonce, hash_result = found
+                elapsed = time.time() - start_time
+                hash_hex = hash_result[::-1].hex()
+                print(f"\n*** GENESIS FOUND! ***")
+                print(f"  Nonce: {nonce}")
+                print(f"  Hash: {hash_hex}")
+                print(f"  Time: {elapsed:.2f} seconds")
+                print(f"\nUse these values in chainparams.cpp:")
+                print(f"  genesis = CreateGenesisBlock({timestamp}, {nonce}, 0x{bits:08x}, {version}, 88 * COIN);")
+                print(f"  assert(consensus.hashGenesisBlock == uint256S(\"0x{hash_hex}\"));")
+                return nonce, hash_hex
+            
             now = time.time()
             if now - last_print >= 5:
-                rate = nonce / (now - start_time)
+                nonce = min(start_nonce + (i + 1) * NONCE_CHUNK, NONCE_LIMIT)
+                rate = (nonce - start_nonce) / (now - start_time)
                 print(f"  Nonce: {nonce:,} ({rate:.0f} H/s)")
                 last_print = now
-        
-        if nonce > 0xFFFFFFFF:
-            print("Nonce overflow - increase timestamp and retry")
-            return None, None
+    
+    print("Nonce overflow - increase timestamp and retry")
+    return None, None
 
 if __name__ == "__main__":
     # Dogecoin genesis merkle root (same for all Dogecoin chains)
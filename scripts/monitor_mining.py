@@ -6,6 +6,7 @@ Displays real-time dashboard of Dogecoin testnet mining activity
 
 import subprocess
 import json
+import re
 import time
 import sys
 from datetime import datetime
@@ -56,16 +57,101 @@ recent_candidates = deque(maxlen=10)
 last_candidate_count = 0
 candidate_times = deque(maxlen=100)  # Track timestamps for hashrate calculation
 
-def run_ssh_command(cmd):
-    """Execute command on remote host via SSH"""
+# Log lines counted by update_log_state, by counter name
+LOG_COUNTERS = {
+    'multiaddr_accepted': 'Multiaddress merged block accepted!',
+    'legacy_accepted': 'rpc_submitblock returned: None',
+    'duplicate': 'duplicate',  # also matches duplicate-inconclusive
+    'bad_cb_height': 'bad-cb-height',
+    'shares': 'GOT SHARE',
+    'candidates': 'Dogecoin block candidate',
+}
+INCONCLUSIVE_RE = re.compile(r'rejected.*inconclusive')
+
+# Incremental log parsing: bytes of P2POOL_LOG already scanned, running
+# counts of LOG_COUNTERS (plus 'inconclusive') in them, and the latest
+# share and candidate lines
+log_state = {
+    'offset': 0,
+    'counts': dict.fromkeys([*LOG_COUNTERS, 'inconclusive'], 0),
+    'shares': deque(maxlen=100),
+    'candidates': deque(maxlen=20),
+}
+
+# Calls per batched RPC request (one SSH round trip each)
+RPC_BATCH_SIZE = 100
+
+# Share one SSH connection between all commands: the first one opens a master
+# connection that later ones reuse (kept 60s after the last), so each refresh
+# pays for a single SSH handshake
+SSH_OPTIONS = [
+    "-o", "ControlMaster=auto",
+    "-o", "ControlPath=/tmp/p2pool-mon-%r@%h:%p",
+    "-o", "ControlPersist=60",
+]
+
+# Separates the outputs of commands run together by run_ssh_commands
+SECTION_MARK = "===P2POOL-MON-SECTION==="
+
+def run_ssh_command(cmd, input=None):
+    """Execute command on remote host via SSH (input is fed to its stdin)"""
     result = subprocess.run(
-        ["ssh", SSH_HOST, cmd],
+        ["ssh", *SSH_OPTIONS, SSH_HOST, cmd],
+        input=input,
         capture_output=True,
         text=True,
         timeout=10
     )
     return result.stdout.strip()
 
+def run_ssh_commands(cmds):
+    """Execute several commands on remote host in one SSH call
+    
+    Returns the output of each command, in order.
+    """
+    script = f"; echo {SECTION_MARK}; ".join(f"{{ {cmd}; }}" for cmd in cmds)
+    return [output.strip() for output in run_ssh_command(script).split(SECTION_MARK)]
+
+def update_log_state():
+    """Scan the P2Pool log lines appended since the last update
+    
+    Only the new bytes are read (from the start again if the log shrank,
+    i.e. was rotated), and only lines of interest are sent back over SSH.
+    A line P2Pool is still writing is left for the next update, so the
+    scan stops after the last newline (end).
+    """
+    offset = log_state['offset']
+    patterns = " ".join(f"-e '{pattern}'" for pattern in [*LOG_COUNTERS.values(), 'inconclusive'])
+    start, end, lines = run_ssh_commands([
+        f'size=$(stat -c%s {P2POOL_LOG} 2>/dev/null || echo 0); '
+        f'start={offset}; [ "$size" -lt $start ] && start=0; echo "$start"',
+        # read only succeeds on a newline-terminated last line
+        f'partial=$(tail -c +$((start + 1)) {P2POOL_LOG} 2>/dev/null | head -c $((size - start)) '
+        f'| tail -n 1 | {{ IFS= read -r line || printf %s "$line"; }} | wc -c); '
+        f'end=$((size - partial)); echo "$end"',
+        f'tail -c +$((start + 1)) {P2POOL_LOG} 2>/dev/null | head -c $((end - start)) | LC_ALL=C grep -F {patterns}',
+    ])
+    
+    counts = log_state['counts']
+    if int(start) < offset:
+        for name in counts:
+            counts[name] = 0
+        log_state['shares'].clear()
+        log_state['candidates'].clear()
+    
+    for line in lines.split('\n'):
+        for name, pattern in LOG_COUNTERS.items():
+            if pattern in line:
+                counts[name] += 1
+        if INCONCLUSIVE_RE.search(line):
+            counts['inconclusive'] += 1
+        if 'GOT SHARE' in line:
+            log_state['shares'].append(line)
+        if 'Dogecoin block candidate' in line:
+            log_state['candidates'].append(line)
+    
+    log_state['offset'] = int(end)
+
 def rpc_call(method, params=[]):
     """Make RPC call to Dogecoin daemon"""
     cmd = f'curl -s --user {DOGE_RPC_USER}:{DOGE_RPC_PASS} --data-binary \'{{"jsonrpc":"1.0","id":"monitor","method":"{method}","params":{json.dumps(params)}}}\' -H "content-type: text/plain;" {DOGE_RPC_URL}'
@@ -75,6 +161,42 @@ def rpc_call(method, params=[]):
     except:
         return None
 
+def rpc_batch(calls):
+    """Make several RPC calls to Dogecoin daemon as JSON-RPC batch requests
+    
+    calls is a list of (method, params). Returns the results in the same
+    order, None for calls that failed.
+    """
+    # The batch goes to curl on stdin, so it can be any size
+    cmd = f'curl -s --user {DOGE_RPC_USER}:{DOGE_RPC_PASS} --data-binary @- -H "content-type: text/plain;" {DOGE_RPC_URL}'
+    results = []
+    for start in range(0, len(calls), RPC_BATCH_SIZE):
+        chunk = calls[start:start + RPC_BATCH_SIZE]
+        payload = json.dumps([
+            {"jsonrpc": "1.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(chunk)
+        ])
+        by_id = {}
+        try:
+            for reply in json.loads(run_ssh_command(cmd, payload)):
+                by_id[reply.get("id")] = reply.get("result")
+        except:
+            pass
+        results.extend(by_id.get(i) for i in range(len(chunk)))
+    return results
+
+def get_blocks(heights):
+    """Fetch blocks (with decoded transactions) at the given heights
+    
+    Returns (height, block_hash, block) for each height that could be read,
+    in the order given: one batch of getblockhash, then one of getblock.
+    """
+    hashes = rpc_batch([("getblockhash", [height]) for height in heights])
+    found = [(height, block_hash) for height, block_hash in zip(heights, hashes) if block_hash]
+    blocks = rpc_batch([("getblock", [block_hash, 2]) for height, block_hash in found])
+    return [(height, block_hash, block)
+            for (height, block_hash), block in zip(found, blocks) if block]
+
 def get_network_info():
     """Get current network mining info"""
     return rpc_call("getmininginfo")
@@ -119,16 +241,8 @@ def scan_blockchain_for_address(address, num_blocks=100):
         total_received = 0
         blocks_with_payments = 0
         
-        for i in range(min(num_blocks, current_height)):
-            height = current_height - i
-            block_hash = rpc_call("getblockhash", [height])
-            if not block_hash:
-                continue
-            
-            block = rpc_call("getblock", [block_hash, 2])
-            if not block:
-                continue
-            
+        heights = [current_height - i for i in range(min(num_blocks, current_height))]
+        for height, block_hash, block in get_blocks(heights):
             # Check coinbase transaction
             coinbase_tx = block["tx"][0]
             for vout in coinbase_tx.get("vout", []):
@@ -153,29 +267,21 @@ def get_submission_stats():
             'other': 0
         }
         
-        # Method 1: Count "Multiaddress merged block accepted!" messages (new format)
-        cmd_multiaddr = "grep -c 'Multiaddress merged block accepted!' " + P2POOL_LOG + " 2>/dev/null || echo 0"
-        multiaddr_accepted = int(run_ssh_command(cmd_multiaddr))
+        counts = log_state['counts']
         
-        # Method 2: Count "rpc_submitblock returned: None" (legacy format)
-        cmd_legacy = "grep -c 'rpc_submitblock returned: None' " + P2POOL_LOG + " 2>/dev/null || echo 0"
-        legacy_accepted = int(run_ssh_command(cmd_legacy))
+        # "Multiaddress merged block accepted!" (new format) vs
+        # "rpc_submitblock returned: None" (legacy format): use the higher
+        # count (should not double-count as formats differ)
+        stats['accepted'] = max(counts['multiaddr_accepted'], counts['legacy_accepted'])
         
-        # Use the higher count (should not double-count as formats differ)
-        stats['accepted'] = max(multiaddr_accepted, legacy_accepted)
+        # Rejections - both multiaddress and legacy
+        stats['inconclusive'] = counts['inconclusive']
         
-        # Count rejections - both multiaddress and legacy
-        cmd_inconclusive = r"grep -c 'rejected: inconclusive\|rejected.*inconclusive' " + P2POOL_LOG + " 2>/dev/null || echo 0"
-        stats['inconclusive'] = int(run_ssh_command(cmd_inconclusive))
+        # duplicate/duplicate-inconclusive
+        stats['duplicate'] = counts['duplicate']
         
-        # Count duplicate/duplicate-inconclusive
-        cmd_duplicate = r"grep -c 'duplicate\|duplicate-inconclusive' " + P2POOL_LOG + " 2>/dev/null || echo 0"
-        dup_count = int(run_ssh_command(cmd_duplicate))
-        stats['duplicate'] = dup_count
-        
-        # Count bad-cb-height errors
-        cmd_cb = "grep -c 'bad-cb-height' " + P2POOL_LOG + " 2>/dev/null || echo 0"
-        stats['bad_cb_height'] = int(run_ssh_command(cmd_cb))
+        # bad-cb-height errors
+        stats['bad_cb_height'] = counts['bad_cb_height']
         
         return stats
     except Exception as e:
@@ -184,16 +290,15 @@ def get_submission_stats():
 def get_p2pool_share_stats():
     """Get P2Pool share statistics from logs"""
     try:
-        # Count total shares
-        cmd_shares = "grep -c 'GOT SHARE' " + P2POOL_LOG + " 2>/dev/null || echo 0"
-        total_shares = int(run_ssh_command(cmd_shares))
+        total_shares = log_state['counts']['shares']
         
-        # Get recent shares (last 5)
-        cmd_recent = "grep 'GOT SHARE' " + P2POOL_LOG + " | tail -5"
-        recent_output = run_ssh_command(cmd_recent)
+        # Last 100 shares: recent ones, first and last for the share rate
+        shares = list(log_state['shares'])
+        first_line = shares[0] if shares else ''
+        last_line = shares[-1] if shares else ''
         
         recent_shares = []
-        for line in recent_output.split('\n'):
+        for line in shares[-5:]:
             if 'GOT SHARE' in line:
                 try:
                     # Parse: "2025-12-25 06:48:45.918342 GOT SHARE! mm3suEPoj... dd1bda5e prev c7a4df62 age 0.89s"
@@ -214,11 +319,6 @@ def get_p2pool_share_stats():
                     continue
         
         # Calculate share rate (shares in last minute)
-        cmd_rate = "grep 'GOT SHARE' " + P2POOL_LOG + " | tail -100 | head -1"
-        first_line = run_ssh_command(cmd_rate)
-        cmd_last = "grep 'GOT SHARE' " + P2POOL_LOG + " | tail -1"
-        last_line = run_ssh_command(cmd_last)
-        
         shares_per_min = 0
         if first_line and last_line and total_shares >= 2:
             try:
@@ -241,36 +341,19 @@ def get_p2pool_share_stats():
 def check_accepted_blocks_orphan_status():
     """Check which of our accepted blocks are still in the blockchain vs orphaned"""
     try:
-        # Get all accepted block submissions with context
-        cmd = "grep -B5 'rpc_submitblock returned: None' " + P2POOL_LOG + " | grep -E '(Building Dogecoin auxpow block|rpc_submitblock returned: None)' | head -100"
-        result = run_ssh_command(cmd)
-        
-        # Parse to find block heights from getblocktemplate
-        # We need to check if the block at that height matches our submission
-        # Since we don't log the exact height, we'll check recent blocks for our address pattern
-        
-        # Alternative: Check recent blockchain blocks for our mining address
+        # We don't log the exact height of accepted submissions, so check
+        # recent blockchain blocks for our address pattern instead
         current_height = get_block_count()
         if not current_height:
             return {'in_chain': 0, 'orphaned': 0, 'unknown': 0, 'checked': 0}
         
         our_blocks_in_chain = 0
-        blocks_checked = 0
         
         # Check last 500 blocks for our address (covers ~2 minutes at 0.26s/block)
-        for i in range(min(500, current_height)):
-            height = current_height - i
-            blocks_checked += 1
-            
+        heights = [current_height - i for i in range(min(500, current_height))]
+        blocks_checked = len(heights)
+        for height, block_hash, block in get_blocks(heights):
             try:
-                block_hash = rpc_call("getblockhash", [height])
-                if not block_hash:
-                    continue
-                    
-                block = rpc_call("getblock", [block_hash, 2])
-                if not block:
-                    continue
-                
                 # Check coinbase transaction
                 coinbase_tx = block["tx"][0]
                 vouts = coinbase_tx.get("vout", [])
@@ -295,7 +378,7 @@ def check_accepted_blocks_orphan_status():
                 continue
         
         # Get total accepted from logs (both new and legacy format)
-        cmd_total = "grep -c 'Multiaddress merged block accepted!\\|rpc_submitblock returned: None' " + P2POOL_LOG + " 2>/dev/null || echo 0"
+        cmd_total = "LC_ALL=C grep -cF -e 'Multiaddress merged block accepted!' -e 'rpc_submitblock returned: None' " + P2POOL_LOG + " 2>/dev/null || echo 0"
         total_accepted = int(run_ssh_command(cmd_total))
         
         orphaned = max(0, total_accepted - our_blocks_in_chain)
@@ -312,8 +395,17 @@ def check_accepted_blocks_orphan_status():
 def check_recent_accepted_blocks():
     """Check coinbase outputs of recently accepted blocks"""
     try:
-        # Find timestamps of accepted blocks (both new and legacy format)
-        cmd = r"grep -B10 'Multiaddress merged block accepted!\|rpc_submitblock returned: None' " + P2POOL_LOG + " | grep 'Dogecoin block candidate' | tail -5"
+        # Find candidates within the 10 lines before an accepted block (both
+        # new and legacy format), like grep -B10 ... | grep candidate but in
+        # a single pass: remember recent candidate lines in an 11-slot ring
+        # (line number + text) and print the unprinted ones on each accept
+        awk_prog = (
+            'index($0, "Dogecoin block candidate") { nr[NR % 11] = NR; line[NR % 11] = $0 } '
+            'index($0, "Multiaddress merged block accepted!") || index($0, "rpc_submitblock returned: None") { '
+            'for (i = (NR - 10 > done ? NR - 10 : done + 1); i <= NR; i++) if (nr[i % 11] == i) print line[i % 11]; '
+            'done = NR }'
+        )
+        cmd = f"LC_ALL=C awk '{awk_prog}' {P2POOL_LOG} | tail -5"
         result = run_ssh_command(cmd)
         
         blocks_info = []
@@ -338,16 +430,8 @@ def check_recent_blocks(num_blocks=10):
     
     found_blocks = []
     # Only scan last 10 blocks for speed over SSH
-    for i in range(min(num_blocks, 10)):
-        height = current_height - i
-        block_hash = rpc_call("getblockhash", [height])
-        if not block_hash:
-            continue
-            
-        block = rpc_call("getblock", [block_hash, 2])
-        if not block:
-            continue
-        
+    heights = [current_height - i for i in range(min(num_blocks, 10))]
+    for height, block_hash, block in get_blocks(heights):
         coinbase_tx = block["tx"][0]
         vouts = coinbase_tx.get("vout", [])
         
@@ -371,16 +455,11 @@ def get_candidate_info():
     """Get block candidate information from P2Pool log"""
     global last_candidate_count, recent_candidates, candidate_times
     
-    # Count total candidates
-    count_cmd = f'grep -c "Dogecoin block candidate" {P2POOL_LOG} 2>/dev/null || echo 0'
-    total_candidates = int(run_ssh_command(count_cmd))
+    total_candidates = log_state['counts']['candidates']
     
-    # Get recent candidates if count increased
+    # Parse recent candidates if count increased
     if total_candidates > last_candidate_count:
-        candidates_cmd = f'grep "Dogecoin block candidate" {P2POOL_LOG} | tail -20'
-        candidates_output = run_ssh_command(candidates_cmd)
-        
-        for line in candidates_output.split('\n'):
+        for line in log_state['candidates']:
             if 'pow_hash=' in line and 'ratio=' in line:
                 try:
                     # Parse timestamp
@@ -456,16 +535,8 @@ def get_donation_balance(mined_blocks):
         donation_total = 0
         
         # Only check blocks we mined (much faster)
-        for block_info in mined_blocks:
-            height = block_info['height']
-            block_hash = rpc_call("getblockhash", [height])
-            if not block_hash:
-                continue
-            
-            block = rpc_call("getblock", [block_hash, 2])
-            if not block:
-                continue
-            
+        heights = [block_info['height'] for block_info in mined_blocks]
+        for height, block_hash, block in get_blocks(heights):
             # Check coinbase transaction for donation output
             coinbase_tx = block["tx"][0]
             vouts = coinbase_tx.get("vout", [])
@@ -668,6 +739,7 @@ def main():
         while True:
             try:
                 # Fetch data silently
+                update_log_state()
                 network_info = get_network_info()
                 balance = get_balance()
                 total_candidates, recent = get_candidate_info()
@@ -675,7 +747,7 @@ def main():
                 # Calculate local mining stats
                 local_stats = calculate_local_stats(network_info)
                 
-                # Get submission statistics (fast - just grep counts)
+                # Get submission statistics (running counts from update_log_state)
                 submission_stats = get_submission_stats()
                 
                 # Get P2Pool share statistics